@@ -2,7 +2,13 @@ from settings import *
 from ui.utils import *
 
 class Animated:
-    def __init__(self, pos, frames):
+    # Slotted and resettable so instances can be recycled through an ObjectPool
+    __slots__ = ('frames', 'frame_index', 'image', 'rect', 'finished')
+
+    def __init__(self, *args):
+        self.reset(*args)
+
+    def reset(self, pos, frames):
         self.frames = frames
         self.frame_index = 0
         
@@ -12,13 +18,15 @@ class Animated:
         self.finished = False
 
     def draw(self, screen):
-        screen.blit(self.image, self.rect)
+        return screen.blit(self.image, self.rect)
 
 class CherryBomb(Animated):
-    def __init__(self, zombie, frames, func):
+    __slots__ = ('target', 'animation_speed', 'func')
+
+    def reset(self, zombie, frames, func):
         self.target = zombie
         self.animation_speed = 30  
-        super().__init__(self.target.rect.center, frames)
+        super().reset(self.target.rect.center, frames)
         self.rect.midbottom = self.target.rect.midbottom
         self.func = func
 
@@ -36,8 +44,10 @@ class CherryBomb(Animated):
             self.image = self.frames[int(self.frame_index)]
 
 class BoomDie(Animated):
-    def __init__(self, pos, frames):
-        super().__init__(pos, frames)
+    __slots__ = ('animation_speed',)
+
+    def reset(self, pos, frames):
+        super().reset(pos, frames)
         self.animation_speed = 15  
 
     def update(self, dt):
@@ -51,8 +61,10 @@ class BoomDie(Animated):
             self.image = self.frames[int(self.frame_index)]
 
 class SunFlower(Animated):
-    def __init__(self, pos, frames):
-        super().__init__(pos, frames)
+    __slots__ = ('animation_speed',)
+
+    def reset(self, pos, frames):
+        super().reset(pos, frames)
         self.animation_speed = 7  
 
     def update(self, dt):
@@ -64,12 +76,17 @@ class SunFlower(Animated):
         self.image = self.frames[int(self.frame_index)]
 
 class Boom:
-    def __init__(self, image, func, zombie):
+    __slots__ = ('image', 'rect', 'duration', 'elapsed', 'finished', 'func', 'target')
+
+    def __init__(self, *args):
+        self.reset(*args)
+
+    def reset(self, image, func, zombie):
         self.image = image
         self.rect = self.image.get_rect(center=zombie.rect.center) 
         
         self.duration = 100 
-        self.start_time = pygame.time.get_ticks()
+        self.elapsed = 0  # ms of game time shown so far
         
         self.finished = False
         self.func = func
@@ -79,19 +96,21 @@ class Boom:
         if self.finished:
             return
             
-        current_time = pygame.time.get_ticks()
-        if current_time - self.start_time >= self.duration:
+        self.elapsed += dt * 1000
+        if self.elapsed >= self.duration:
             self.finished = True
             if self.func:
                 self.func(self.target)
 
     def draw(self, screen):
         self.image.set_alpha(150) 
-        screen.blit(self.image, self.rect)
+        return screen.blit(self.image, self.rect)
 
 class Sun(Animated):
-    def __init__(self, pos, frames):
-        super().__init__(pos, frames)
+    __slots__ = ('animation_speed',)
+
+    def reset(self, pos, frames):
+        super().reset(pos, frames)
         self.animation_speed = 10 # Tốc độ quay của mặt trời
 
     def update(self, dt):
@@ -0,0 +1,140 @@
+"""
+Texture atlas for the frame animations.
+
+Build the atlas once from the project root:
+    python atlas.py
+
+This packs every frame of the animations below into one sprite sheet
+(assets/atlas/atlas.png) with a JSON manifest of frame rects. At runtime
+load_atlas() loads and converts that sheet once and hands out the frames
+as subsurfaces. The manifest also records the size and modification time
+of every source frame; when the atlas has not been built, or a frame was
+edited, added or removed since, the game falls back to loading each folder
+frame by frame until the atlas is built again.
+"""
+
+from settings import *
+from ui.utils import *
+from bundle import source_manifest
+
+ATLAS_DIR = join('assets', 'atlas')
+ATLAS_IMAGE = join(ATLAS_DIR, 'atlas.png')
+ATLAS_MANIFEST = join(ATLAS_DIR, 'atlas.json')
+ATLAS_MAX_WIDTH = 2048
+ATLAS_PADDING = 1
+
+ANIMATIONS = {
+    'Zombie': ('assets', 'images', 'Zombie'),
+    'CherryBomb': ('assets', 'images', 'CherryBomb'),
+    'BoomDie': ('assets', 'images', 'BoomDie'),
+    'SunFlower': ('assets', 'images', 'menu', 'SunFlower'),
+    'Sun': ('assets', 'images', 'menu', 'Sun'),
+}
+
+
+def pack_shelves(sizes, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """
+    Place rectangles left to right on shelves, tallest first.
+
+    Returns (positions, sheet_size) with positions in the order of `sizes`.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+    positions = [None] * len(sizes)
+    x = y = shelf_height = sheet_width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            y += shelf_height + padding
+            x = shelf_height = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+        sheet_width = max(sheet_width, x - padding)
+    return positions, (sheet_width, y + shelf_height)
+
+
+def frame_paths(animations=ANIMATIONS):
+    """Every source frame of `animations`, in atlas order"""
+    return [frame_path for path in animations.values() for frame_path in folder_frame_paths(*path)]
+
+
+def build_atlas(animations=ANIMATIONS):
+    frames = []  # (name, surface)
+    for name, path in animations.items():
+        for frame_path in folder_frame_paths(*path):
+            frames.append((name, pygame.image.load(frame_path)))
+
+    positions, size = pack_shelves([surf.get_size() for _, surf in frames])
+    sheet = pygame.Surface(size, pygame.SRCALPHA)
+    manifest = {'image': os.path.basename(ATLAS_IMAGE), 'size': list(size), 'animations': {},
+                'sources': source_manifest(frame_paths(animations))}
+    for (name, surf), pos in zip(frames, positions):
+        sheet.blit(surf, pos)
+        manifest['animations'].setdefault(name, []).append([pos[0], pos[1], *surf.get_size()])
+
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    pygame.image.save(sheet, ATLAS_IMAGE)
+    with open(ATLAS_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+def read_manifest():
+    """The atlas manifest, or None if no atlas was built or its source frames changed since"""
+    if not (os.path.exists(ATLAS_IMAGE) and os.path.exists(ATLAS_MANIFEST)):
+        return None
+    with open(ATLAS_MANIFEST, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('sources') != source_manifest(frame_paths()):
+        return None
+    return manifest
+
+
+def request_atlas():
+    """Start decoding the atlas sheet in the background; returns its loader key, or None if there is no usable atlas"""
+    if read_manifest() is None:
+        return None
+    return assets_registry.request(ATLAS_IMAGE)
+
+
+def request_animations():
+    """Loader keys covering every animation: the atlas, or every folder frame"""
+    atlas_key = request_atlas()
+    if atlas_key:
+        return [atlas_key]
+    return [assets_registry.request(frame_path) for frame_path in frame_paths()]
+
+
+def load_atlas():
+    """Return {animation name: [frame subsurfaces]}, or None if there is no usable atlas"""
+    manifest = read_manifest()
+    if manifest is None:
+        return None
+    sheet = assets_registry.image(ATLAS_IMAGE)
+    return {name: [sheet.subsurface(rect) for rect in rects]
+            for name, rects in manifest['animations'].items()}
+
+
+def import_animation(atlas, name):
+    """Frames of animation `name` from the atlas when present, else from its folder"""
+    if atlas and name in atlas:
+        return atlas[name]
+    return import_folder(*ANIMATIONS[name])
+
+
+def release_animation(atlas, name):
+    """Give back the frames import_animation() returned; atlas frames go with the sheet"""
+    if not (atlas and name in atlas):
+        release_folder(*ANIMATIONS[name])
+
+
+def release_atlas(atlas):
+    """Give back the sheet load_atlas() took"""
+    if atlas is not None:
+        assets_registry.release(ATLAS_IMAGE)
+
+
+if __name__ == "__main__":
+    manifest = build_atlas()
+    frame_count = sum(len(rects) for rects in manifest['animations'].values())
+    print(f"Packed {frame_count} frames into {ATLAS_IMAGE} ({manifest['size'][0]}x{manifest['size'][1]})")
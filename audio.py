@@ -1,6 +1,8 @@
 import pygame as py
 import random 
 from ui.utils import *
+from voices import VoiceManager
+from sfx import SfxSynth
 
 folder = "audio/"
 
@@ -28,21 +30,91 @@ music_dict = [
 zombie_groan_dict = ["groan_0", "groan_1", "groan_2"]
 zombie_appear_dict = ["digging_0", "digging_1"]
 
-py.mixer.init()
-py.mixer.set_num_channels(32)
+# Long tracks are streamed through pygame.mixer.music, one at a time, instead
+# of being decoded into memory; everything else is a short in-memory Sound
+music_tracks = ["zen_garden", "looboon", "brainiac_maniac", "grasswalk", "losemusic"]
+MUSIC_FADE_OUT = 500  # ms the old track fades out before the next one starts
 
+def sound_paths():
+    """{name: file path} of every sound and music track"""
+    paths = {x: mp3(x) for x in music_dict + zombie_groan_dict + zombie_appear_dict}
+    paths.update(audio_paths('assets', 'audio'))
+    return paths
+
+def music_paths():
+    """Files of the streamed music tracks, without starting the mixer"""
+    paths = sound_paths()
+    return [paths[x] for x in music_tracks]
+
+# Needs the mixer initialised (see main.Game)
 class audio:
     def __init__(self):
-        self.zombie_groan_sound = [py.mixer.Sound(mp3(x)) for x in zombie_groan_dict]
-        self.zombie_appear_sound = [py.mixer.Sound(mp3(x)) for x in zombie_appear_dict]
-        self.sounds = [py.mixer.Sound(mp3(x)) for x in music_dict]
-        self.sounds_0 = audio_importer('assets', 'audio')
+        # Nothing is decoded here: sounds are decoded on the asset loader's
+        # threads when requested, or on first use
+        self.paths = sound_paths()
+        self.keys = {}  # name -> asset loader key, while decoding
+        self.sounds = {}  # name -> decoded sound
+        self.voices = VoiceManager()  # channel budget for the effects
+        self.sfx = SfxSynth()  # procedural effects, generated once
+
+        self.track = None  # music track playing, or starting once the old one has faded out
+        self.next_track = None  # (name, loop, fade_in) waiting for that fade out
+
+    def music_paths(self):
+        return [self.paths[x] for x in music_tracks]
+
+    def request(self, names=None):
+        """Start decoding `names` (default: every short sound) in the background; returns the loader keys"""
+        keys = []
+        for x in (names or [x for x in self.paths if x not in music_tracks]):
+            if x in self.sounds:
+                continue
+            if x not in self.keys:
+                self.keys[x] = assets_loader.request_sound(self.paths[x])
+            keys.append(self.keys[x])
+        return keys
+
+    def get(self, name):
+        """Decoded sound, waiting for it if it is still loading"""
+        if name not in self.sounds:
+            self.request([name])
+            self.sounds[name] = assets_loader.get(self.keys.pop(name))
+        return self.sounds[name]
+
+    # Switch the streamed music to `name`, fading the current track out first
+    def play_music(self, name, loop=-1, fade_in=0):
+        self.track = name
+        if py.mixer.music.get_busy():
+            py.mixer.music.fadeout(MUSIC_FADE_OUT)
+            self.next_track = (name, loop, fade_in)
+        else:
+            self.next_track = None
+            self.start_music(name, loop, fade_in)
+
+    def start_music(self, name, loop, fade_in):
+        py.mixer.music.load(self.paths[name])
+        py.mixer.music.set_volume(1)
+        py.mixer.music.play(loop, 0, fade_in)
+
+    # stop the music if `name` is the current track (another track may have replaced it)
+    def stop_music(self, name):
+        if self.track != name:
+            return
+        self.track = None
+        self.next_track = None
+        py.mixer.music.fadeout(MUSIC_FADE_OUT)
+
+    # called every frame: start the next track once the old one has faded out
+    def update(self):
+        self.voices.begin_frame()
+        if self.next_track and not py.mixer.music.get_busy():
+            self.start_music(*self.next_track)
+            self.next_track = None
 
     # Sound.play(loops, max time, fade-in)
-    # general play sound
-    def play(self, sound, volume=1, loop=0, duration=0, fade_in=0):
-        sound.set_volume(volume)
-        sound.play(loop, duration, fade_in)
+    # general play sound, through the voice manager (see voices.py)
+    def play(self, sound, volume=1, loop=0, duration=0, fade_in=0, category='ui', pan=0.0):
+        return self.voices.play(sound, category, volume, pan, loop, duration, fade_in)
 
     # general stop sound
     def stop(self, sound):
@@ -51,68 +123,74 @@ class audio:
 
     # play when game open, back to main menu
     def play_background(self):
-        self.play(self.sounds[ZEN_GARDEN], 1, -1)
+        self.play_music('zen_garden', -1)
 
     def stop_background(self):
-        self.stop(self.sounds[ZEN_GARDEN])
+        self.stop_music('zen_garden')
 
     # play game starts
     def play_start_sound(self):
-        self.play(self.sounds[START], 1, 0)
+        self.play(self.get('start'), 1, 0)
 
     def play_awooga_sound(self):
-        self.play(self.sounds_0['awooga'], 1, 0)
+        self.play(self.get('awooga'), 1, 0)
 
     # play when game started in first 1 minute
     def play_grasswalk(self):
-        self.play(self.sounds_0['grasswalk'], 1, -1, 0, 1000)
+        self.play_music('grasswalk', -1, 1000)
 
     def stop_grasswalk(self):
-        self.stop(self.sounds_0['grasswalk'])
+        self.stop_music('grasswalk')
 
     # play when game started in next 1 minute
     def play_looboon(self):
-        self.play(self.sounds[LOOBOON], 1, -1, 0, 1000)
+        self.play_music('looboon', -1, 1000)
 
     def stop_looboon(self):
-        self.stop(self.sounds[LOOBOON])
+        self.stop_music('looboon')
 
     # play when game started after 2 minutes
     def play_brain_maniac(self):
-        self.play(self.sounds[BRAINIAC_MANIAC], 1, -1, 0, 1000)
+        self.play_music('brainiac_maniac', -1, 1000)
 
     def stop_brain_maniac(self):
-        self.stop(self.sounds[BRAINIAC_MANIAC])
+        self.stop_music('brainiac_maniac')
 
     # play when game over
     def play_lose_sound(self):
-        self.play(self.sounds[LOSE], 1, 0)
+        self.play(self.get('lose'), 1, 0, category='alert')
 
     def play_losemusic_sound(self):
-        self.play(self.sounds_0['losemusic'], 1, 0)
+        self.play_music('losemusic', 0)
 
     def play_scream_sound(self):
-        self.play(self.sounds_0['scream'], 1, 0)
+        self.play(self.get('scream'), 1, 0, category='alert')
 
     # play when zombie come our house
-    def play_eat_sound(self):
-        self.play(self.sounds[EAT], 1, 0)
+    def play_eat_sound(self, pan=0.0):
+        self.play(self.get('eat'), 1, 0, category='alert', pan=pan)
 
     # play when hit zombie
-    def play_bonk_sound(self):
-        self.play(self.sounds[BONK], 1, 0)
+    def play_bonk_sound(self, pan=0.0):
+        self.play(self.get('bonk'), 1, 0, category='hit', pan=pan)
+
+    def play_cherrybomb(self, pan=0.0):
+        self.play(self.get('cherrybomb'), 1, 0, category='hit', pan=pan)
 
-    def play_cherrybomb(self):
-        self.play(self.sounds_0['cherrybomb'], 1, 0)
+    # procedural blip on a kill, pitched up with the combo (needs NumPy)
+    def play_hit_tone(self, combo, pan=0.0):
+        sound = self.sfx.hit(combo)
+        if sound:
+            self.play(sound, 1, 0, category='hit', pan=pan)
 
     # every 3 seconds check if there is a zombie in screen then play this sound
     def play_zombie_groan(self):
         rd = random.randint(0,2)
-        self.play(self.zombie_groan_sound[rd], 0.8)
+        self.play(self.get(zombie_groan_dict[rd]), 0.8, category='ambient')
 
     # play when zombie appear
-    def play_zombie_appear(self):
+    def play_zombie_appear(self, pan=0.0):
         rd = random.randint(0,1)
-        self.play(self.zombie_appear_sound[rd], 0.2)
+        self.play(self.get(zombie_appear_dict[rd]), 0.2, category='spawn', pan=pan)
 
 
@@ -0,0 +1,153 @@
+"""
+Batch simulator for difficulty tuning.
+
+Plays many headless rounds with scripted bots (bot.py) on every CPU core
+and writes one CSV row per round plus a JSON summary per bot
+configuration: survival time, score, accuracy and how the kills split
+over the PERFECT / GREAT / GOOD / NOT BAD categories.
+
+    python batch.py --games 2000
+    python batch.py --games 500 --policy nearest oldest --miss-rate 0.05 0.2
+    python batch.py --games 1000 --tune difficulty_interval=20000 --tune max_graves=24
+
+Every combination of the --reaction, --miss-rate and --policy values is
+one configuration, and each plays --games rounds on seeds --seed,
+--seed + 1, ... so configurations are compared on the same rounds and a
+batch run again gives the same results. --tune overrides GameState's
+difficulty knobs (simulation.TUNING); spawn_intervals takes a
+comma-separated list.
+
+Rounds are independent and a worker only returns a small dict per round,
+so throughput grows close to linearly with --workers up to the number of
+physical cores.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import csv
+import itertools
+import json
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from settings import *
+from simulation import GameState, TUNING
+from bot import Bot, POLICIES, DISTRIBUTIONS
+from profiler import percentile
+
+CATEGORIES = ('PERFECT', 'GREAT', 'GOOD', 'NOT BAD')
+CONFIG_FIELDS = ('reaction', 'reaction_sd', 'miss_rate', 'policy', 'distribution')
+ROUND_FIELDS = ('seed', 'time', 'score', 'final_score', 'accuracy', 'hits', 'misses', 'max_combo') + CATEGORIES
+
+
+def play_round(job):
+    """Play one round with a bot; returns the round's results"""
+    config, tuning, seed, max_time, use_store = job
+    sim = GameState(seed, use_store=use_store, tuning=tuning)
+    bot = Bot(seed=seed, **config)
+    categories = dict.fromkeys(CATEGORIES, 0)
+    limit = max_time * 1000
+    clicks = ()
+    while not sim.over and sim.clock.now < limit:
+        for event in sim.step(TIMESTEP, clicks):
+            if event[0] == 'kill':
+                categories[event[3]] += 1
+        clicks = bot.clicks(sim)
+    return {**config, 'seed': seed, 'score': sim.score, 'final_score': sim.final_score(),
+            **sim.stats(), **categories}
+
+
+def summarize(rows):
+    """Aggregate the rounds of one configuration"""
+    times = [row['time'] for row in rows]
+    kills = sum(row['hits'] for row in rows)
+    return {
+        'games': len(rows),
+        'time': {'mean': statistics.fmean(times), 'p10': percentile(times, 10),
+                 'median': statistics.median(times), 'p90': percentile(times, 90)},
+        'score': statistics.fmean(row['score'] for row in rows),
+        'final_score': statistics.fmean(row['final_score'] for row in rows),
+        'accuracy': statistics.fmean(row['accuracy'] for row in rows),
+        'max_combo': statistics.fmean(row['max_combo'] for row in rows),
+        'categories': {category: (sum(row[category] for row in rows) / kills if kills else 0)
+                       for category in CATEGORIES},
+    }
+
+
+def parse_tuning(values):
+    tuning = {}
+    for value in values:
+        name, _, setting = value.partition('=')
+        if name not in TUNING or not setting:
+            raise argparse.ArgumentTypeError(f"--tune expects one of {', '.join(TUNING)} as name=value, got {value!r}")
+        if name == 'spawn_intervals':
+            tuning[name] = tuple(int(interval) for interval in setting.split(','))
+        else:
+            tuning[name] = int(setting)
+    return tuning
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless rounds with bots and aggregate the results")
+    parser.add_argument('--games', type=int, default=1000, help="rounds per bot configuration")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first round")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--reaction', type=float, nargs='+', default=[350], help="mean reaction time (ms)")
+    parser.add_argument('--reaction-sd', type=float, default=80, help="reaction time standard deviation (ms)")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='normal')
+    parser.add_argument('--miss-rate', type=float, nargs='+', default=[0.1], help="fraction of clicks that miss")
+    parser.add_argument('--policy', choices=POLICIES, nargs='+', default=['nearest'])
+    parser.add_argument('--tune', action='append', default=[], metavar='NAME=VALUE',
+                        help="override a difficulty knob: " + ', '.join(TUNING))
+    parser.add_argument('--max-time', type=float, default=600, help="end rounds after this many seconds of game time")
+    parser.add_argument('--store', action='store_true', help="use the NumPy zombie store")
+    parser.add_argument('--out', default='batch_results', help="output path prefix for .csv and .json")
+    args = parser.parse_args()
+    try:
+        tuning = parse_tuning(args.tune)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+
+    configs = [{'reaction': reaction, 'reaction_sd': args.reaction_sd, 'miss_rate': miss_rate,
+                'policy': policy, 'distribution': args.distribution}
+               for reaction, miss_rate, policy in itertools.product(args.reaction, args.miss_rate, args.policy)]
+    jobs = [(config, tuning, args.seed + i, args.max_time, args.store)
+            for config in configs for i in range(args.games)]
+
+    start = time.perf_counter()
+    # A few chunks per worker keeps the pipe traffic low and the workers evenly loaded
+    chunksize = max(1, len(jobs) // (args.workers * 4))
+    with ProcessPoolExecutor(args.workers) as pool:
+        rows = list(pool.map(play_round, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    game_seconds = sum(row['time'] for row in rows)
+    print(f"{len(rows)} rounds ({game_seconds / 3600:.1f} h of game time) on {args.workers} workers "
+          f"in {elapsed:.1f} s: {len(rows) / elapsed:.0f} rounds/s, {game_seconds / elapsed:.0f}x real time")
+
+    os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+    with open(args.out + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CONFIG_FIELDS + ROUND_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summary = []
+    for config in configs:
+        result = summarize([row for row in rows if all(row[key] == config[key] for key in CONFIG_FIELDS)])
+        summary.append({'bot': config, **result})
+        print(f"  {config['policy']:<8} reaction {config['reaction']:.0f} ms, miss {config['miss_rate']:.0%}: "
+              f"survived {result['time']['median']:.1f} s (p10 {result['time']['p10']:.1f}, "
+              f"p90 {result['time']['p90']:.1f}), score {result['final_score']:.0f}, "
+              f"accuracy {result['accuracy']:.1f}%")
+    with open(args.out + '.json', 'w') as f:
+        json.dump({'tuning': tuning, 'games': args.games, 'seed': args.seed, 'max_time': args.max_time,
+                   'elapsed': elapsed, 'rounds_per_second': len(rows) / elapsed, 'configs': summary}, f, indent=2)
+    print(f"Results written to {args.out}.csv and {args.out}.json")
+
+
+if __name__ == "__main__":
+    main()
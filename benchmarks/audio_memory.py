@@ -0,0 +1,65 @@
+"""
+Memory held by audio: music decoded into Sounds vs streamed.
+
+Run from the project root:
+    python -m benchmarks.audio_memory
+
+Each mode runs in a fresh interpreter that loads every short sound, then
+either decodes the music tracks into Sounds as the game used to, or plays
+one of them through pygame.mixer.music as it does now. PCM is the decoded
+sample data held in Sounds; RSS is the peak resident size of the process
+(not available on Windows).
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import subprocess
+import sys
+
+import pygame
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+
+
+def child(mode):
+    import audio as audio_module
+
+    pygame.init()
+    pygame.mixer.init()
+    audio = audio_module.audio()
+    sounds = [audio.get(name) for name in audio.paths if name not in audio_module.music_tracks]
+    if mode == 'decoded':
+        sounds += [pygame.mixer.Sound(path) for path in audio.music_paths()]
+    else:
+        audio.play_background()
+    pcm = sum(len(sound.get_raw()) for sound in sounds)
+    print(pcm / 2**20, peak_rss_mb())
+
+
+def main():
+    print(f"{'music':>8} {'PCM MB':>8} {'peak RSS MB':>12}")
+    for mode in ('decoded', 'streamed'):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.audio_memory', '--child', mode],
+                                capture_output=True, text=True, check=True).stdout
+        pcm, rss = (float(value) for value in output.split()[-2:])
+        print(f"{mode:>8} {pcm:>8.1f} {rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        child(sys.argv[2])
+    else:
+        main()
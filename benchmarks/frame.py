@@ -0,0 +1,237 @@
+"""
+Per-phase frame timings for fixed scenarios.
+
+Run from the project root:
+    python -m benchmarks.frame --out before.json
+    (change something)
+    python -m benchmarks.frame --out after.json --compare before.json
+
+Each scenario sets up the real Game with the dummy video and audio
+drivers and runs a fixed number of frames the way the playing state does:
+one simulation step (Game.step) and one draw (Game.draw_playing) each.
+The hot paths are timed through a Profiler (profiler.py), so the game
+code runs unchanged. step and draw_playing include the phases under them.
+
+    zombies_N       N zombies walking, topped up as they reach the house
+    popups_N        N CartoonPopupTexts on screen at once
+    bombs           100 zombies, 20 of them clicked every half second, so
+                    CherryBomb -> Boom -> BoomDie chains overlap
+    menu            the main menu, redrawn from scratch every frame
+    scores          the high score table
+
+The report gives count, mean, p50, p90, p99 and max in ms for every
+phase; --compare prints how the p50 and p90 of each phase moved against
+an earlier report. Positions come from a fixed seed, so two runs draw the
+same frames.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+from datetime import datetime
+
+import pygame
+
+import main as game_main
+from settings import *
+from loader import assets_loader
+from profiler import Profiler
+from simulation import HOUSE_X
+
+WARMUP_FRAMES = 30
+POPUPS = [("PERFECT", GOLD), ("GREAT", GREEN), ("GOOD", BLUE), ("NOT BAD", WHITE), ("Miss!", RED)]
+REPORTED = ('p50', 'p90')
+
+
+def fill_zombies(sim, count, rng, spread=False):
+    """Top the round up to `count` zombies, across the field or at the graves' edge"""
+    while len(sim.zombies) < count:
+        low = HOUSE_X + ZOMBIE_SIZE[0] if spread else int(SCREEN_WIDTH * 0.7)
+        sim.add_zombie(rng.randrange(LANES), rng.randint(low, SCREEN_WIDTH - 80), sim.clock.now)
+
+
+def walking(count):
+    def setup(game, rng):
+        fill_zombies(game.sim, count, rng, spread=True)
+
+    def feed(game, frame, rng):
+        fill_zombies(game.sim, count, rng)
+    return setup, feed
+
+
+def popups(count):
+    def feed(game, frame, rng):
+        while len(game.cartoon_popups) < count:
+            text, color = rng.choice(POPUPS)
+            popup = game.popup_pool.acquire(rng.randint(100, SCREEN_WIDTH - 100),
+                                            rng.randint(150, SCREEN_HEIGHT - 100), text, color)
+            game.cartoon_popups.add(popup)
+    return None, feed
+
+
+def bombs(zombies=100, burst=20, every=30):
+    def setup(game, rng):
+        fill_zombies(game.sim, zombies, rng, spread=True)
+
+    def feed(game, frame, rng):
+        fill_zombies(game.sim, zombies, rng)
+        if frame % every == 0:
+            clickable = [zombie for bucket in game.sim.zombie_index.buckets for zombie in bucket]
+            for zombie in rng.sample(clickable, min(burst, len(clickable))):
+                game.handle_click(zombie.rect.center)
+    return setup, feed
+
+
+def play_frame(game):
+    game.step(TIMESTEP)
+    game.draw_playing(1.0)
+    game.renderer.present()
+
+
+def menu_frame(game):
+    game.menu.invalidate()
+    game.renderer.present(game.menu.draw_main_menu())
+
+
+def scores_frame(game):
+    game.menu.draw_scores_menu(game.score_manager)
+    game.renderer.present()
+
+
+SCENARIOS = {
+    'zombies_10': (walking(10), play_frame),
+    'zombies_100': (walking(100), play_frame),
+    'zombies_1000': (walking(1000), play_frame),
+    'popups_50': (popups(50), play_frame),
+    'popups_200': (popups(200), play_frame),
+    'bombs': (bombs(), play_frame),
+    'menu': ((None, None), menu_frame),
+    'scores': ((None, None), scores_frame),
+}
+
+
+def make_game():
+    game_main.REPORT_STARTUP_TIME = False
+    game_main.REPORT_ASSET_MEMORY = False
+    game_main.RECORD_REPLAYS = False
+    game = game_main.Game()
+    assets_loader.wait(game.request_game_assets())
+    game.load_assets()
+    return game
+
+
+def instrument(profiler, game):
+    profiler.instrument(game, 'step')
+    profiler.instrument(game, 'draw_playing')
+    profiler.instrument(game.sim, 'update_zombies')
+    profiler.instrument(game, 'update_effects')
+    profiler.instrument(game, 'update_cartoon_popups')
+    profiler.instrument(game, 'draw_zombies')
+    profiler.instrument(game, 'draw_hit_effects')
+    profiler.instrument(game, 'draw_effects')
+    profiler.instrument(game, 'draw_cartoon_popups')
+    profiler.instrument(game, 'draw_game_ui')
+    profiler.instrument(game.score_bar, 'draw', 'ScoreBar.draw')
+    profiler.instrument(game.menu, 'draw_main_menu')
+    profiler.instrument(game.menu, 'draw_scores_menu')
+    profiler.instrument(game.renderer, 'present')
+
+
+def run_scenario(game, name, frames, seed):
+    (setup, feed), frame = SCENARIOS[name]
+    rng = random.Random(seed)
+    game.reset_game()
+    game.sim.scheduler.clear()  # no spawns, graves, music or groans: the scenario decides what is on screen
+    game.renderer.invalidate()
+    if setup:
+        setup(game, rng)
+
+    profiler = Profiler()
+    instrument(profiler, game)
+    try:
+        for i in range(WARMUP_FRAMES + frames):
+            if i == WARMUP_FRAMES:
+                profiler.clear()
+            if feed:
+                feed(game, i, rng)
+            game.sim.health = INITIAL_HEALTH  # never let the round end
+            with profiler.phase('frame'):
+                frame(game)
+    finally:
+        profiler.restore()
+    return profiler.summary()
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    for name, phases in report['scenarios'].items():
+        old_phases = baseline['scenarios'].get(name)
+        if old_phases is None:
+            continue
+        print(f"{name}")
+        for phase, stats in phases.items():
+            old = old_phases.get(phase)
+            if old is None:
+                continue
+            changes = ''.join(f"  {key} {old[key]:.3f} -> {stats[key]:.3f} ms ({(stats[key] / old[key] - 1) * 100:+.0f}%)"
+                              if old[key] else f"  {key} {old[key]:.3f} -> {stats[key]:.3f} ms"
+                              for key in REPORTED)
+            print(f"  {phase:<24}{changes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the update and draw phases of fixed scenarios")
+    parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help="default: all of " + ', '.join(SCENARIOS))
+    parser.add_argument('--frames', type=int, default=300, help="measured frames per scenario")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--out', help="write the report to this JSON file")
+    parser.add_argument('--compare', metavar='REPORT', help="earlier report to compare against")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    game = make_game()
+    report = {
+        'commit': git_commit(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'frames': args.frames,
+        'seed': args.seed,
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        phases = report['scenarios'][name] = run_scenario(game, name, args.frames, args.seed)
+        print(f"{name}")
+        print(f"  {'phase':<24}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  (ms)")
+        for phase, stats in phases.items():
+            print(f"  {phase:<24}" + ''.join(f"{stats[key]:>9.3f}" for key in ('mean', 'p50', 'p90', 'p99', 'max')))
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nAgainst {args.compare} (commit {baseline.get('commit')})")
+        compare(report, baseline)
+    assets_loader.shutdown()
+
+
+if __name__ == "__main__":
+    main()
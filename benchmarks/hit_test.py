@@ -0,0 +1,58 @@
+"""
+Compare LaneIndex hit-testing against the old linear scan over all zombies.
+
+Run from the project root:
+    python -m benchmarks.hit_test
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import random
+import timeit
+
+from settings import *
+from zombie import Zombie
+from spatial_index import LaneIndex
+
+ZOMBIE_COUNTS = [10, 100, 1000]
+CLICKS = 1000
+
+
+def linear_hit_test(zombies, pos):
+    for zombie in zombies:
+        if zombie.is_clickable() and zombie.get_hit_rect().collidepoint(pos):
+            return zombie
+    return None
+
+
+def make_scene(count, rng):
+    zombies = []
+    index = LaneIndex(ZOMBIE_SIZE)
+    for _ in range(count):
+        zombie = Zombie(rng.randrange(LANES), rng.randint(int(SCREEN_WIDTH * 0.2), SCREEN_WIDTH), ZOMBIE_SIZE)
+        zombies.append(zombie)
+        index.add(zombie)
+    clicks = [(rng.randrange(SCREEN_WIDTH), rng.randrange(100, SCREEN_HEIGHT)) for _ in range(CLICKS)]
+    return zombies, index, clicks
+
+
+def main():
+    rng = random.Random(1234)
+
+    print(f"{'zombies':>8} {'linear us/click':>16} {'index us/click':>16} {'speedup':>8}")
+    for count in ZOMBIE_COUNTS:
+        zombies, index, clicks = make_scene(count, rng)
+
+        # Both must pick the same zombie for every click
+        for pos in clicks:
+            assert linear_hit_test(zombies, pos) is index.hit_test(pos), pos
+
+        linear = min(timeit.repeat(lambda: [linear_hit_test(zombies, pos) for pos in clicks], number=1, repeat=5))
+        indexed = min(timeit.repeat(lambda: [index.hit_test(pos) for pos in clicks], number=1, repeat=5))
+        print(f"{count:>8} {linear / CLICKS * 1e6:>16.2f} {indexed / CLICKS * 1e6:>16.2f} {linear / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
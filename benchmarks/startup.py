@@ -0,0 +1,94 @@
+"""
+Startup time, with and without the pre-decoded asset bundle.
+
+Build the bundle first, then run from the project root:
+    python bundle.py
+    python -m benchmarks.startup
+
+Each sample is a fresh interpreter that imports the game, constructs Game
+and runs the real main loop until the menu is on screen (first frame) and
+the game assets decoding behind it are ready. Before assets were loaded
+lazily the first frame came after all of them. The OS file cache is warm
+after the first run, so this measures decoding rather than disk reads.
+"""
+
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import statistics
+import subprocess
+import sys
+import time
+
+import pygame
+
+RUNS = 5
+COLUMNS = ('import', 'Game()', 'first frame', 'assets ready')
+
+
+class QuitWhenLoaded:
+    """Stands in for Game.clock: once the game assets were requested, wait for them and quit"""
+    def __init__(self, game, clock, times):
+        self.game = game
+        self.clock = clock
+        self.times = times
+
+    def tick(self, *args):
+        from loader import assets_loader
+        keys = self.game.game_asset_keys
+        if keys is not None and 'ready' not in self.times:
+            assets_loader.wait(keys)
+            self.times['ready'] = time.perf_counter()
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        return self.clock.tick(*args)
+
+
+def child(use_bundle):
+    import bundle
+    bundle.enabled = use_bundle
+
+    start = time.perf_counter()
+    import main
+    main.REPORT_STARTUP_TIME = False
+    imported = time.perf_counter()
+    game = main.Game()
+    constructed = time.perf_counter()
+
+    times = {}
+    game.clock = QuitWhenLoaded(game, game.clock, times)
+    game.run()
+    first_frame = main.launch_time + game.startup_times['first_frame'] / 1000
+    print(imported - start, constructed - start, first_frame - start, times['ready'] - start,
+          bundle.get_bundle() is not None)
+
+
+def sample(use_bundle):
+    output = subprocess.run([sys.executable, '-m', 'benchmarks.startup', '--child', str(int(use_bundle))],
+                            capture_output=True, text=True, check=True).stdout
+    *times, bundled = output.split()[-len(COLUMNS) - 1:]
+    return [float(t) * 1000 for t in times], bundled == 'True'
+
+
+def main():
+    from bundle import BUNDLE_PATH
+    modes = [False]
+    if os.path.exists(BUNDLE_PATH):
+        modes.append(True)
+    else:
+        print(f"No bundle at {BUNDLE_PATH}, timing the source files only (build it with: python bundle.py)")
+
+    print(f"{'mode':>8}" + ''.join(f"{name:>14}" for name in COLUMNS) + f"  (ms since start, median of {RUNS})")
+    for use_bundle in modes:
+        samples = [sample(use_bundle) for _ in range(RUNS)]
+        if use_bundle and not all(bundled for _, bundled in samples):
+            sys.exit("The bundle is stale, rebuild it with: python bundle.py")
+        medians = [statistics.median(times[i] for times, _ in samples) for i in range(len(COLUMNS))]
+        print(f"{'bundle' if use_bundle else 'source':>8}" + ''.join(f"{ms:>14.1f}" for ms in medians))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--child':
+        child(sys.argv[2] == '1')
+    else:
+        main()
@@ -0,0 +1,89 @@
+"""
+Scripted players for headless rounds.
+
+A Bot looks at a GameState after each step and returns the clicks for the
+next one, the same inputs a player's mouse produces. Like a player it
+needs a reaction time to notice the first zombie and between clicks, it
+misses some of its clicks and it picks targets by a fixed policy:
+
+    nearest     the zombie closest to the house
+    oldest      the zombie that has been up the longest
+    newest      the zombie that rose last (chases PERFECT hits)
+    random      any clickable zombie
+
+Reaction times are drawn from a normal or log-normal distribution with
+the given mean and standard deviation (ms), never faster than
+MIN_REACTION. The bot has its own random.Random, so a seeded bot playing
+a seeded round always makes the same clicks.
+"""
+
+import math
+import random
+
+from settings import *
+
+MIN_REACTION = 100  # ms, about the fastest a person reacts to a visual cue
+POLICIES = ('nearest', 'oldest', 'newest', 'random')
+DISTRIBUTIONS = ('normal', 'lognormal')
+
+
+class Bot:
+    def __init__(self, reaction=350, reaction_sd=80, miss_rate=0.1, policy='nearest',
+                 distribution='normal', seed=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown targeting policy {policy!r}, expected one of {', '.join(POLICIES)}")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown reaction distribution {distribution!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+        self.reaction = reaction
+        self.reaction_sd = reaction_sd
+        self.miss_rate = miss_rate
+        self.policy = policy
+        self.distribution = distribution
+        self.rng = random.Random(seed)
+        self.choose = getattr(self, 'choose_' + policy)
+        if distribution == 'lognormal':
+            # Parameters of the underlying normal for the requested mean and sd
+            sigma2 = math.log(1 + (reaction_sd / reaction) ** 2)
+            self.mu, self.sigma = math.log(reaction) - sigma2 / 2, math.sqrt(sigma2)
+        self.next_click = None  # game time (ms) of the next click, None while there is nothing to click
+
+    def reaction_time(self):
+        if self.distribution == 'lognormal':
+            delay = self.rng.lognormvariate(self.mu, self.sigma)
+        else:
+            delay = self.rng.gauss(self.reaction, self.reaction_sd)
+        return max(MIN_REACTION, delay)
+
+    def choose_nearest(self, zombies):
+        return min(zombies, key=lambda zombie: zombie.rect.right)
+
+    def choose_oldest(self, zombies):
+        return min(zombies, key=lambda zombie: (zombie.spawn_time, zombie.index_order))
+
+    def choose_newest(self, zombies):
+        return max(zombies, key=lambda zombie: (zombie.spawn_time, zombie.index_order))
+
+    def choose_random(self, zombies):
+        return self.rng.choice(sorted(zombies, key=lambda zombie: zombie.index_order))
+
+    def clicks(self, sim):
+        """Clicks (screen positions) to apply on the next step of `sim`"""
+        now = sim.clock.now
+        # The hit-test index holds exactly the zombies that can still be clicked
+        zombies = [zombie for bucket in sim.zombie_index.buckets for zombie in bucket]
+        if not zombies:
+            # Idle: the next zombie takes a reaction time to notice
+            self.next_click = None
+            return ()
+        if self.next_click is None:
+            self.next_click = now + self.reaction_time()
+        if now < self.next_click:
+            return ()
+        self.next_click = now + self.reaction_time()
+
+        rect = self.choose(zombies).rect
+        if self.rng.random() < self.miss_rate:
+            # Just wide of the target; it can still land on a zombie next to it
+            offset = rect.width // 2 + self.rng.randint(5, 40)
+            return ((rect.centerx + self.rng.choice((-offset, offset)), rect.centery),)
+        return (rect.center,)
@@ -0,0 +1,225 @@
+"""
+Pre-decoded asset bundle.
+
+Build it from the project root (again whenever the assets change):
+    python bundle.py
+
+Cold start is dominated by PNG/JPG decoding, the crop + scale of the
+background and MP3/OGG decoding. The bundle stores every image as raw RGBA,
+the background already cropped and scaled to the screen size, and every
+short sound as PCM in the mixer's format (music tracks are streamed from
+their files, see audio.py). At startup the file is memory-mapped and
+entries become surfaces through pygame.image.frombuffer and sounds through
+pygame.mixer.Sound(buffer=...).
+
+The bundle records a content hash of the source assets, and for the check
+at startup their sizes and modification times and the mixer format, so
+startup only stats the source files instead of reading them. When any of
+those no longer matches, or the bundle was never built, get_bundle()
+returns None and everything is loaded from the source files.
+
+File layout: a header (magic, index offset, index length), the entry data
+with every entry aligned to ALIGN bytes, then the JSON index. Offsets in
+the index are absolute.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from os.path import join, normpath
+
+import pygame
+
+BUNDLE_DIR = join('assets', 'bundle')
+BUNDLE_PATH = join(BUNDLE_DIR, 'assets.bin')
+BUNDLE_MAGIC = b'ZWBUNDL1'
+HEADER = struct.Struct('<8sQI')
+ALIGN = 16
+
+SOURCE_DIRS = (join('assets', 'images'), join('assets', 'audio'), 'audio')
+IMAGE_EXTENSIONS = ('.png', '.jpg')
+SOUND_EXTENSIONS = ('.mp3', '.ogg', '.wav')
+
+BACKGROUND_PATH = join('assets', 'images', 'screen', 'Background.jpg')
+BACKGROUND_CROP = 0.76  # keep the road, drop the house side of the picture
+
+# Set to False to always load from the source files (see benchmarks/startup.py)
+enabled = True
+_bundle = None
+_checked = False
+_lock = threading.Lock()  # the asset loader opens the bundle from its worker threads
+
+
+def source_files(exclude=()):
+    """Relative paths of every bundled source asset but `exclude`, sorted"""
+    exclude = {normpath(source) for source in exclude}
+    paths = []
+    for source_dir in SOURCE_DIRS:
+        for folder_path, _, file_names in os.walk(source_dir):
+            for file_name in file_names:
+                path = normpath(join(folder_path, file_name))
+                if file_name.lower().endswith(IMAGE_EXTENSIONS + SOUND_EXTENSIONS) and path not in exclude:
+                    paths.append(path)
+    return sorted(paths)
+
+
+def content_hash(paths):
+    """Hash of the source files plus the mixer format the sounds are decoded to"""
+    digest = hashlib.sha1(BUNDLE_MAGIC)
+    digest.update(repr(pygame.mixer.get_init()).encode())
+    for path in paths:
+        digest.update(path.encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def source_manifest(paths):
+    """[path, size, mtime] of every file, cheap to compare at startup"""
+    manifest = []
+    for path in paths:
+        stat = os.stat(path)
+        manifest.append([path, stat.st_size, stat.st_mtime_ns])
+    return manifest
+
+
+def fingerprint(paths):
+    """What a bundle built from `paths` is checked against when it is opened"""
+    return {'mixer': repr(pygame.mixer.get_init()), 'sources': source_manifest(paths)}
+
+
+def background_key(size):
+    return f'background@{size[0]}x{size[1]}'
+
+
+def crop_background(surf, size):
+    """Crop the road out of the background picture and scale it to `size`"""
+    crop_width = int(surf.get_width() * BACKGROUND_CROP)
+    return pygame.transform.scale(surf.subsurface((0, 0, crop_width, surf.get_height())), size)
+
+
+def build_bundle(screen_size, path=BUNDLE_PATH, exclude=()):
+    """Decode every source asset but `exclude` and write the bundle; needs the mixer initialised"""
+    paths = source_files(exclude)
+    blobs = []  # (key, entry, data)
+    for source in paths:
+        if source.lower().endswith(IMAGE_EXTENSIONS):
+            surf = pygame.image.load(source)
+            blobs.append((source, {'kind': 'image', 'size': list(surf.get_size()), 'format': 'RGBA'},
+                          pygame.image.tobytes(surf, 'RGBA')))
+        else:
+            blobs.append((source, {'kind': 'sound'}, pygame.mixer.Sound(source).get_raw()))
+
+    background = crop_background(pygame.image.load(BACKGROUND_PATH), screen_size)
+    blobs.append((background_key(screen_size), {'kind': 'image', 'size': list(screen_size), 'format': 'RGB'},
+                  pygame.image.tobytes(background, 'RGB')))
+
+    data_start = -(-HEADER.size // ALIGN) * ALIGN
+    entries = {}
+    offset = data_start
+    for key, entry, data in blobs:
+        entry['offset'] = offset
+        entry['length'] = len(data)
+        entries[key] = entry
+        offset += -(-len(data) // ALIGN) * ALIGN
+    index_bytes = json.dumps({'hash': content_hash(paths), 'fingerprint': fingerprint(paths),
+                              'entries': entries}).encode()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(BUNDLE_MAGIC, offset, len(index_bytes)))
+        for key, entry, data in blobs:
+            f.seek(entry['offset'])
+            f.write(data)
+        f.seek(offset)
+        f.write(index_bytes)
+    os.replace(temp_path, path)
+    return entries
+
+
+class AssetBundle:
+    def __init__(self, path=BUNDLE_PATH):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset, index_length = HEADER.unpack_from(self.data)
+        if magic != BUNDLE_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an asset bundle")
+        index = json.loads(self.data[index_offset:index_offset + index_length])
+        self.hash = index['hash']
+        self.fingerprint = index.get('fingerprint')
+        self.entries = index['entries']
+
+    def __contains__(self, key):
+        return normpath(key) in self.entries
+
+    def view(self, key):
+        entry = self.entries[normpath(key)]
+        return memoryview(self.data)[entry['offset']:entry['offset'] + entry['length']]
+
+    def decode_image(self, key):
+        """Surface over the mapped pixels, not yet converted to the display format"""
+        entry = self.entries[normpath(key)]
+        return pygame.image.frombuffer(self.view(key), entry['size'], entry['format'])
+
+    def image(self, key, alpha=True):
+        """Surface converted to the display format; the display mode must be set"""
+        surf = self.decode_image(key)
+        # convert copies the pixels, so the surface does not keep the mapping alive
+        return surf.convert_alpha() if alpha else surf.convert()
+
+    def sound(self, key):
+        # Sound(buffer=...) copies the PCM data
+        return pygame.mixer.Sound(buffer=self.view(key))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+def load_bundle(path=BUNDLE_PATH, exclude=()):
+    """Open the bundle at `path`, or return None if it is missing, corrupt or stale
+
+    `exclude` must be what the bundle was built without, so the hash covers the same files.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if bundle.fingerprint != fingerprint(source_files(exclude)):
+        bundle.close()
+        return None
+    return bundle
+
+
+def get_bundle():
+    """The game's bundle, opened and checked on first use; None when not usable"""
+    global _bundle, _checked
+    if not enabled:
+        return None
+    with _lock:
+        if not _checked:
+            _checked = True
+            # Imported here: audio imports the loader, which imports this module
+            from audio import music_paths
+            _bundle = load_bundle(exclude=music_paths())
+    return _bundle
+
+
+if __name__ == "__main__":
+    from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+    from audio import music_paths
+
+    # Sounds are decoded to the mixer's format
+    pygame.init()
+    pygame.mixer.init()
+    entries = build_bundle((SCREEN_WIDTH, SCREEN_HEIGHT), exclude=music_paths())
+    kinds = [entry['kind'] for entry in entries.values()]
+    print(f"Bundled {kinds.count('image')} images and {kinds.count('sound')} sounds "
+          f"into {BUNDLE_PATH} ({os.path.getsize(BUNDLE_PATH) / 2**20:.1f} MB)")
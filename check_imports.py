@@ -0,0 +1,50 @@
+"""
+Import check for every module.
+
+Run from the project root:
+    python check_imports.py
+
+Each module is imported on its own in a fresh interpreter, the way a tool
+or a test that only needs it would, so an import cycle that only shows up
+for one import order fails here instead of in whoever imports it first.
+Importing a module must not open a window or start the mixer either
+(settings.py holds constants only, see main.Game). Exits with status 1 if
+any module fails.
+"""
+
+import os
+import subprocess
+import sys
+
+PACKAGES = ('', 'ui', 'benchmarks')
+SKIPPED = ('check_imports',)
+CHECK = ("import importlib, sys, pygame; importlib.import_module(sys.argv[1]); "
+         "sys.exit('opened pygame on import' if pygame.display.get_init() or pygame.mixer.get_init() else 0)")
+
+
+def module_names(root='.'):
+    names = []
+    for package in PACKAGES:
+        for file_name in sorted(os.listdir(os.path.join(root, package))):
+            name, extension = os.path.splitext(file_name)
+            if extension == '.py' and name != '__init__' and name not in SKIPPED:
+                names.append(f"{package}.{name}" if package else name)
+    return names
+
+
+def main():
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    failed = []
+    for name in module_names():
+        result = subprocess.run([sys.executable, '-c', CHECK, name], capture_output=True, text=True, env=env)
+        if result.returncode:
+            error = (result.stderr.strip().splitlines() or ['failed'])[-1]
+            failed.append(name)
+            print(f"  {name}: {error}")
+    print(f"{len(failed)} of {len(module_names())} modules failed to import on their own" if failed
+          else f"All {len(module_names())} modules import on their own")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Entity manager for zombies, effects, hit effects and popups.
+
+Each layer is an EntityList: updating it is a single pass that steps every
+entity and compacts the survivors in place, so removal costs nothing extra
+and no copy of the list is made. Entities added while a layer is being
+updated (e.g. CherryBomb.func -> create_boom -> create_explosion) are held
+back and appended after the pass, in the order they were added, so they
+are first updated on the next frame just like with the old list copies.
+"""
+
+
+class EntityList:
+    def __init__(self):
+        self.items = []
+        self.pending = []
+        self.updating = False
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items) + len(self.pending)
+
+    def add(self, entity):
+        if self.updating:
+            self.pending.append(entity)
+        else:
+            self.items.append(entity)
+
+    def clear(self):
+        self.items.clear()
+        self.pending.clear()
+
+    def update(self, step, *args):
+        """
+        Call step(entity, *args) on every entity and keep the ones for which
+        it returns True. Relative order of survivors is preserved.
+        """
+        items = self.items
+        keep = 0
+        self.updating = True
+        for entity in items:
+            if step(entity, *args):
+                # Writing behind the read position is safe while iterating
+                items[keep] = entity
+                keep += 1
+        del items[keep:]
+        self.updating = False
+
+        if self.pending:
+            items.extend(self.pending)
+            self.pending.clear()
+
+
+class EntityManager:
+    """Named EntityList layers, kept in draw order (back to front)"""
+    def __init__(self, layer_names):
+        self.layers = {name: EntityList() for name in layer_names}
+
+    def __getitem__(self, name):
+        return self.layers[name]
+
+    def clear(self):
+        for layer in self.layers.values():
+            layer.clear()
+
+    def counts(self):
+        return {name: len(layer) for name, layer in self.layers.items()}
@@ -0,0 +1,36 @@
+"""
+Game clock.
+
+Everything in a round is timed on game time rather than on
+pygame.time.get_ticks(): the clock is read once per frame from the frame
+time the main loop already measures, stands still while the game is not
+being played, and runs `scale` times faster than real time (below 1 for
+slow motion, above 1 to fast-forward). Game time itself only moves in the
+fixed simulation steps, so a round replays the same way at any frame rate
+or scale. Entities get the current game time passed in instead of reading
+a clock themselves.
+"""
+
+
+class GameClock:
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.paused = False
+        self.now = 0.0  # ms of game time since the round started
+
+    def frame(self, real_dt):
+        """Seconds of game time to simulate for a frame that took `real_dt` seconds"""
+        if self.paused:
+            return 0.0
+        return real_dt * self.scale
+
+    def step(self, dt):
+        """Move game time on by one simulation step of `dt` seconds"""
+        self.now += dt * 1000
+
+    def reset(self):
+        self.now = 0.0
+
+    @property
+    def seconds(self):
+        return self.now / 1000
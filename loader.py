@@ -0,0 +1,129 @@
+"""
+Background asset loader.
+
+Files are decoded on a small thread pool (file reads, PNG/JPG decoding and
+sound decoding release the GIL) while the main thread keeps drawing. Every
+job is a decode step that runs on a worker plus an optional finish step,
+such as converting to the display format, that runs on the main thread when
+the asset is fetched with get().
+
+Requesting a key that is still pending returns the same job, so callers can
+request early and fetch later. The loader hands assets over and does not
+keep them: surfaces are cached by the asset registry (registry.py) and
+sounds by the audio module. All methods are called from the main thread.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from os.path import normpath
+
+import pygame
+
+from bundle import get_bundle, background_key, crop_background, BACKGROUND_PATH
+
+LOADER_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def decode_image(full_path):
+    """Unconverted surface, from the pre-decoded bundle when it has the file"""
+    assets_bundle = get_bundle()
+    if assets_bundle and full_path in assets_bundle:
+        return assets_bundle.decode_image(full_path)
+    return pygame.image.load(full_path)
+
+
+def decode_sound(full_path):
+    assets_bundle = get_bundle()
+    if assets_bundle and full_path in assets_bundle:
+        return assets_bundle.sound(full_path)
+    return pygame.mixer.Sound(full_path)
+
+
+def decode_background(size):
+    """Background cropped and scaled to `size` (done ahead of time in the bundle)"""
+    assets_bundle = get_bundle()
+    if assets_bundle and background_key(size) in assets_bundle:
+        return assets_bundle.decode_image(background_key(size))
+    return crop_background(pygame.image.load(BACKGROUND_PATH), size)
+
+
+def convert_image(surf, alpha=True):
+    return surf.convert_alpha() if alpha else surf.convert()
+
+
+class AssetLoader:
+    def __init__(self, workers=LOADER_WORKERS):
+        self.workers = workers
+        self.executor = None  # started on the first request
+        self.jobs = {}        # key -> Future of the decode step, until fetched
+        self.finishers = {}   # key -> finish step, run by get()
+
+    def request(self, key, decode, *args, finish=None):
+        """Start decode(*args) on a worker unless `key` is already pending; returns `key`"""
+        if key not in self.jobs:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='assets')
+            self.jobs[key] = self.executor.submit(decode, *args)
+            if finish:
+                self.finishers[key] = finish
+        return key
+
+    def request_image(self, full_path, alpha=True):
+        full_path = normpath(full_path)
+        return self.request(('image', full_path, alpha), decode_image, full_path,
+                            finish=lambda surf: convert_image(surf, alpha))
+
+    def request_sound(self, full_path):
+        full_path = normpath(full_path)
+        return self.request(('sound', full_path), decode_sound, full_path)
+
+    def request_background(self, size):
+        size = tuple(size)
+        return self.request(('background', size), decode_background, size,
+                            finish=lambda surf: convert_image(surf, alpha=False))
+
+    def done(self, key):
+        """False only while `key` is still decoding"""
+        return key not in self.jobs or self.jobs[key].done()
+
+    def ready(self, keys):
+        return all(self.done(key) for key in keys)
+
+    def progress(self, keys):
+        """Fraction of `keys` decoded, 1.0 for none"""
+        keys = list(keys)
+        if not keys:
+            return 1.0
+        return sum(self.done(key) for key in keys) / len(keys)
+
+    def wait(self, keys):
+        """Block until every key in `keys` is decoded"""
+        wait_futures([self.jobs[key] for key in keys if key in self.jobs])
+
+    def get(self, key):
+        """
+        Hand over the finished asset and forget the job; blocks if it is still
+        decoding and re-raises decode errors
+        """
+        asset = self.jobs.pop(key).result()
+        finish = self.finishers.pop(key, None)
+        if finish:
+            asset = finish(asset)
+        return asset
+
+    def image(self, full_path, alpha=True):
+        return self.get(self.request_image(full_path, alpha))
+
+    def sound(self, full_path):
+        return self.get(self.request_sound(full_path))
+
+    def shutdown(self):
+        """Drop queued jobs and stop the workers (call before pygame.quit)"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.jobs.clear()
+        self.finishers.clear()
+
+
+assets_loader = AssetLoader()
@@ -1,10 +1,24 @@
+import time
+launch_time = time.perf_counter()  # for the time-to-first-frame report
+
 from settings import *
 
+import audio
 from ui.utils import *
 from assets import *
 from menu import *
-from zombie import *
 from popup_effects import CartoonPopupText
+from renderer import DirtyRenderer
+from pool import ObjectPool
+from entity_manager import EntityManager
+from atlas import load_atlas, import_animation, request_animations, release_animation, release_atlas
+from loader import assets_loader
+from registry import assets_registry
+from simulation import GameState
+from replay import Replay, round_result, differences
+from profiler_overlay import ProfilerOverlay
+from states import STATES
+
 class ScoreManager:
     def __init__(self):
         self.scores_file = "scores.json"
@@ -39,16 +53,22 @@ class ScoreManager:
         return self.scores
 class Game:
     def __init__(self):
-        # sfx.play_background()
+        # Started here rather than when settings is imported (see settings.py)
+        pygame.init()
+        pygame.mixer.init()
+        self.audio = audio.audio()
+        self.audio.sfx.cache_dir = SFX_CACHE_DIR
 
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Whack A Zombie")
         self.clock = pygame.time.Clock()
+        self.renderer = DirtyRenderer(self.screen, DIRTY_RECT_RENDERING, MAX_DIRTY_RATIO)
 
-        self.load_assets()
-
-        # Score bar
-        self.score_bar = ScoreBar(self.sunflower_frames, self.sun_frames)
+        # Game-only assets are decoded in the background once the menu is up
+        # (see request_game_assets); load_assets() picks them up on first play
+        self.game_asset_keys = None
+        self.assets_loaded = False
+        self.startup_times = {}  # ms after launch
         
         # Fonts
         self.font_large = pygame.font.Font(None, 72)
@@ -59,305 +79,353 @@ class Game:
         self.score_manager = ScoreManager()
         self.menu = Menu(self.screen, self.font_large, self.font_medium, self.font_small)
         
-        # Game state
-        self.state = "menu"  # menu, playing, game_over
-        self.reset_game()
-        self.effects = []
+        # Pools for short-lived objects
+        self.effect_pools = {cls: ObjectPool(cls) for cls in (CherryBomb, Boom, BoomDie)}
+        self.popup_pool = ObjectPool(CartoonPopupText)
+        # Effect layers drawn over the zombies, back to front
+        self.entities = EntityManager(('hit_effects', 'effects', 'popups'))
+        self.hit_effects = self.entities['hit_effects']
+        self.effects = self.entities['effects']
+        self.cartoon_popups = self.entities['popups']
+
+        # Game state: the round itself runs headless in the simulation core,
+        # Game turns its events into sounds and effects and draws it
+        self.sim = GameState(use_store=USE_ZOMBIE_STORE, time_scale=TIME_SCALE)
+        self.game_clock = self.sim.clock  # pause-aware game time of the current round
+        self.clicks = []  # clicks since the last simulation step
+        self.recording = None  # Replay of the round being played
+        self.replay = None  # Replay being watched instead of played (see watch)
+        self.replay_clicks = {}
+        self.static_layer = None
         
         self.grave_positions = {}  # Track grave positions for each lane
         self.last_spawn_per_grave = {}  # Track last spawn time for each grave
         self.spawn_delay = 150  # 0.3 seconds delay between spawns from same grave
-        
-        # Load sounds
-        audio.play_background()
-        try:
-            self.hit_sound = self.create_hit_sound()
-        except:
-            self.hit_sound = None
+
+        # Screens: menu, scores, loading, playing, paused, game_over (see states.py)
+        self.states = {cls.name: cls(self) for cls in STATES}
+        self.current = None
+        self.running = True
+        self.change_state("menu")
+        self.profiler_overlay = ProfilerOverlay(self)
+
+    @property
+    def state(self):
+        return self.current.name
+
+    def change_state(self, name):
+        """Leave the current state and enter `name`, running their transition hooks"""
+        previous = self.current.name if self.current else None
+        if self.current:
+            self.current.exit(name)
+        self.current = self.states[name]
+        self.current.enter(previous)
+
+    def request_game_assets(self):
+        """Start decoding everything the playing state needs on the loader threads"""
+        if self.game_asset_keys is None:
+            keys = request_animations()
+            keys.append(assets_registry.request(join('assets', 'images', 'screen', 'Boom.png')))
+            keys.append(assets_registry.request_background((SCREEN_WIDTH, SCREEN_HEIGHT)))
+            keys += [assets_registry.request(path) for path in folder_frame_paths('assets', 'images', 'Grave')]
+            keys += [assets_registry.request(join('assets', 'images', 'menu', name + '.png'))
+                     for name in ScoreBar.IMAGES.values()]
+            keys += self.audio.request()
+            self.game_asset_keys = keys
+        return self.game_asset_keys
 
     def load_assets(self):
-        # graphics
-        self.zombie_frames = import_folder('assets', 'images', 'Zombie')
-        self.cherry_frames = import_folder('assets', 'images', 'CherryBomb')
-        self.explosion_frames = import_folder('assets', 'images', 'BoomDie')
+        """Pick up the decoded game assets; blocks on any that are still loading"""
+        # graphics (from the packed atlas when it has been built, see atlas.py)
+        atlas = self.atlas = load_atlas()
+        self.zombie_frames = import_animation(atlas, 'Zombie')
+        self.cherry_frames = import_animation(atlas, 'CherryBomb')
+        self.explosion_frames = import_animation(atlas, 'BoomDie')
         self.boom_surf = import_image('assets', 'images', 'screen', 'Boom')
-        self.sunflower_frames = import_folder('assets', 'images', 'menu', 'SunFlower')
-        self.sun_frames = import_folder('assets', 'images', 'menu', 'Sun')
-
-        # crop road of background
-        background_surf = import_image('assets', 'images', 'screen', 'Background', format='jpg')
-
-        width = background_surf.get_width()
-        height = background_surf.get_height()
-        crop_width = int(width * 0.76)
-
-        self.background_surf = pygame.transform.scale(background_surf.subsurface((0, 0, crop_width, height)), (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-    def create_hit_sound(self):
-        duration = 0.1
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            wave = 4096 * math.sin(2 * math.pi * 440 * i / sample_rate)
-            arr.append([int(wave), int(wave)])
-        sound = pygame.sndarray.make_sound(pygame.array.array('i', arr))
-        
-        return sound
-    
-    def reset_game(self):
-        self.health = INITIAL_HEALTH
-        self.score = 0
-        self.hits = 0
-        self.misses = 0
-        self.combo = 0
-        self.max_combo = 0
-        self.game_start_time = pygame.time.get_ticks()
-        self.game_end_time = None
-        self.last_zombie_spawn = 0
-        self.zombie_spawn_interval = 2000
-        self.zombies = []
-        self.effects = []
-        self.hit_effects = []
-        self.cartoon_popups = []
-        self.graves = []  # List of graves: each is a dict with x, y, lane, last_spawn
+        self.sunflower_frames = import_animation(atlas, 'SunFlower')
+        self.sun_frames = import_animation(atlas, 'Sun')
+
+        # road of background, cropped and scaled on a loader thread (see loader.decode_background)
+        self.background_surf = assets_registry.background((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.grave_images = import_folder('assets', 'images', 'Grave')
-        self.grave_spawn_delay = 200  # ms
-        self.grave_count = 6
-        self.max_graves = 18
-        self.last_grave_add_time = self.game_start_time
-        self.init_graves()
-
-    def init_graves(self):
-        self.graves = []
-        used_positions = set()
-        for i in range(self.grave_count):
-            while True:
-                lane = random.randint(0, LANES - 1)
-                x = random.randint(int(SCREEN_WIDTH * 0.7), SCREEN_WIDTH - 80)
-                pos = (lane, x)
-                if pos not in used_positions:
-                    used_positions.add(pos)
-                    break
-            y = 150 + lane * LANE_HEIGHT + 25
-            self.graves.append({'lane': lane, 'x': x, 'y': y, 'last_spawn': 0, 'img_idx': i % len(self.grave_images)})
-
-    def add_graves(self, n=2):
-        min_distance = 80  # Khoảng cách tối thiểu giữa các mộ cùng lane
-        used_positions = set((g['lane'], g['x']) for g in self.graves)
-        added = 0
-        tries = 0
-        while added < n and len(self.graves) < self.max_graves and tries < 200:
-            lane = random.randint(0, LANES - 1)
-            x = random.randint(int(SCREEN_WIDTH * 0.7), SCREEN_WIDTH - 80)
-            # Kiểm tra khoảng cách với các mộ cũ cùng lane
-            too_close = False
-            for g in self.graves:
-                if g['lane'] == lane and abs(g['x'] - x) < min_distance:
-                    too_close = True
-                    break
-            if not too_close:
-                y = 150 + lane * LANE_HEIGHT + 25
-                self.graves.append({'lane': lane, 'x': x, 'y': y, 'last_spawn': 0, 'img_idx': len(self.graves) % len(self.grave_images)})
-                used_positions.add((lane, x))
-                added += 1
-            tries += 1
-
-    def spawn_zombie(self):
-        current_time = pygame.time.get_ticks()
-        game_duration = current_time - self.game_start_time
-        # Thêm mộ mới mỗi 30s
-        if (current_time - self.last_grave_add_time) >= 30000:
-            self.add_graves(2)
-            self.last_grave_add_time = current_time
-        # Tính toán spawn_interval như cũ
-        if game_duration < DIFFICULTY_INCREASE_INTERVAL:
-            spawn_interval = 3000
-        elif game_duration < 2*DIFFICULTY_INCREASE_INTERVAL:
-            spawn_interval = 2000
-        elif game_duration < 3*DIFFICULTY_INCREASE_INTERVAL:
-            spawn_interval = 1000
-        elif game_duration < 4*DIFFICULTY_INCREASE_INTERVAL:
-            spawn_interval = 750
-        else:
-            spawn_interval = 500
-        if current_time - self.last_zombie_spawn >= spawn_interval and self.graves:
-            grave = random.choice(self.graves)
-            if current_time - grave['last_spawn'] >= self.grave_spawn_delay:
-                lane = grave['lane']
-                spawn_x = grave['x']
-                zombie = Zombie(lane, spawn_x, self.zombie_frames)
-                audio.play_zombie_appear()
-                self.zombies.append(zombie)
-                self.last_zombie_spawn = current_time
-                grave['last_spawn'] = current_time
 
-    def handle_click(self, pos):
-        hit_zombie = False
-        for zombie in self.zombies[:]:
-            if zombie.is_clickable() and zombie.get_hit_rect().collidepoint(pos):
+        # Score bar
+        self.score_bar = ScoreBar(self.sunflower_frames, self.sun_frames)
 
-                zombie.target = True
+        # procedural hit sounds for every combo pitch
+        if HIT_TONES:
+            self.audio.sfx.warm()
+        self.assets_loaded = True
+        self.profiler_overlay.game_assets_loaded()
+
+        if REPORT_ASSET_MEMORY:
+            groups = ", ".join(f"{group} {size / 2**20:.1f} MB" for group, size in assets_registry.report().items())
+            print(f"Surface memory: {groups}")
+
+    def unload_assets(self):
+        """
+        Give the game-only surfaces back to the registry (see registry.py) when
+        leaving the round; they stay cached until the memory budget needs the
+        room, and load_assets() takes them again on the next play
+        """
+        if not self.assets_loaded:
+            return
+        self.score_bar.release()
+        for name in ('Zombie', 'CherryBomb', 'BoomDie', 'SunFlower', 'Sun'):
+            release_animation(self.atlas, name)
+        release_atlas(self.atlas)
+        release_image('assets', 'images', 'screen', 'Boom')
+        assets_registry.release_background((SCREEN_WIDTH, SCREEN_HEIGHT))
+        release_folder('assets', 'images', 'Grave')
+
+        self.atlas = self.score_bar = self.background_surf = self.boom_surf = None
+        self.zombie_frames = self.cherry_frames = self.explosion_frames = None
+        self.sunflower_frames = self.sun_frames = self.grave_images = None
+        self.static_layer = None
+        self.assets_loaded = False
+        self.game_asset_keys = None  # requested again behind the menu
+
+    def report_startup(self, name):
+        self.startup_times[name] = (time.perf_counter() - launch_time) * 1000
+        if REPORT_STARTUP_TIME:
+            print(f"{name.replace('_', ' ').capitalize()} after {self.startup_times[name]:.0f} ms")
+
+    def start_game(self):
+        """Start a round, going through the loading screen while game assets are still decoding"""
+        if not self.assets_loaded:
+            if not assets_loader.ready(self.request_game_assets()):
+                self.change_state("loading")
+                return
+            self.load_assets()
+        self.change_state("playing")
+
+    def release_entities(self):
+        """Hand effects and popups left from the last round back to their pools"""
+        for effect in self.effects:
+            self.effect_pools[type(effect)].release(effect)
+        for popup in self.cartoon_popups:
+            self.popup_pool.release(popup)
 
-                bomb = CherryBomb(zombie, self.cherry_frames, func=self.create_boom)
-                self.effects.append(bomb)
+    def pool_stats(self):
+        stats = {'Zombie': self.sim.zombie_pool.stats(), 'CartoonPopupText': self.popup_pool.stats()}
+        for cls, pool in self.effect_pools.items():
+            stats[cls.__name__] = pool.stats()
+        return stats
 
-                audio.play_bonk_sound()
+    def reset_game(self):
+        self.release_entities()
+        self.entities.clear()
+        self.clicks.clear()
+        self.static_layer = None
+        if self.replay:
+            self.sim.reset(self.replay.seed)
+            self.replay_clicks = self.replay.clicks_by_step()
+        else:
+            # Seeded so the round can be recorded and replayed
+            seed = random.randrange(2**32)
+            self.sim.reset(seed)
+            self.recording = Replay(seed, TIMESTEP) if RECORD_REPLAYS else None
+
+    def watch(self, replay):
+        """Play back a recorded round (see replay.py) instead of the player's clicks"""
+        self.replay = replay
+        self.start_game()
+
+    def finish_round(self):
+        """Save the recording of the round that just ended, or check the watched replay against it"""
+        result = round_result(self.sim)
+        if self.replay:
+            diff = differences(self.replay.result or {}, result)
+            if diff:
+                print(f"Replay does not match the recording: {diff}")
+            else:
+                print(f"Replay matches: final score {result['final_score']}")
+        elif self.recording:
+            self.recording.result = result
+            print(f"Replay saved to {self.recording.save(REPLAY_DIR)}")
+            self.recording = None
+
+    def change_music(self, phase):
+        if phase == 1:
+            self.audio.play_looboon()
+            self.audio.stop_grasswalk()
+        else:
+            self.audio.stop_looboon()
+            self.audio.play_brain_maniac()
 
-                hit_zombie = True
-                break
-        
-        if not hit_zombie:
-            self.misses += 1
-            self.combo = 0
+    def handle_click(self, pos):
+        # Applied at the start of the next simulation step
+        self.clicks.append(pos)
+
+    def present(self, event):
+        """Turn a simulation event (see simulation.py) into sounds and effects"""
+        kind = event[0]
+        if kind == 'spawn':
+            self.audio.play_zombie_appear(self.pan_at(event[1].rect.centerx))
+        elif kind == 'bomb':
+            zombie = event[1]
+            bomb = self.effect_pools[CherryBomb].acquire(zombie, self.cherry_frames, self.create_boom)
+            self.effects.add(bomb)
+            self.audio.play_bonk_sound(self.pan_at(zombie.rect.centerx))
+        elif kind == 'miss':
             # Hiệu ứng miss popup
-            popup = CartoonPopupText(
+            pos = event[1]
+            popup = self.popup_pool.acquire(
                 pos[0], pos[1] - 40,
                 "Miss!", RED
             )
-            self.cartoon_popups.append(popup)
+            self.cartoon_popups.add(popup)
+        elif kind == 'kill':
+            self.create_explosion(*event[1:])
+        elif kind == 'eat':
+            self.audio.play_eat_sound(self.pan_at(event[1].rect.centerx))
+        elif kind == 'graves':
+            self.static_layer = None
+        elif kind == 'music':
+            self.change_music(event[1])
+        elif kind == 'groan':
+            self.audio.play_zombie_groan()
+        elif kind == 'game_over':
+            self.finish_round()
+            self.change_state("game_over")
+
+    def pan_at(self, x):
+        """Stereo position of screen x for sound effects, -1 (left) to 1 (right)"""
+        return (x / SCREEN_WIDTH * 2 - 1) * STEREO_PANNING
 
     def create_boom(self, zombie):
-        boom = Boom(self.boom_surf, self.create_explosion, zombie)
-        self.effects.append(boom)
-
-    def create_explosion(self, zombie):
-        if not zombie.hit: 
-            score, category, category_color = zombie.take_hit()
+        # The kill itself is timed by the simulation (simulation.KILL_DELAY)
+        boom = self.effect_pools[Boom].acquire(self.boom_surf, None, zombie)
+        self.effects.add(boom)
+
+    def create_explosion(self, zombie, points, category, category_color, combo):
+        explosion = self.effect_pools[BoomDie].acquire(zombie.rect.center, self.explosion_frames)
+        self.effects.add(explosion)
+        if HIT_TONES:
+            self.audio.play_hit_tone(combo - 1, self.pan_at(zombie.rect.centerx))
         
-            explosion = BoomDie(zombie.rect.center, self.explosion_frames)
-            self.effects.append(explosion)
-            
-            combo_bonus = int(score * (self.combo * 0.1))
-            final_score = score + combo_bonus
-            
-            self.score += final_score
-            self.hits += 1
-            self.combo += 1
-            self.max_combo = max(self.max_combo, self.combo)
-            
-            # Create cartoon popup for category
-            popup = CartoonPopupText(
-                zombie.rect.centerx, 
-                zombie.rect.centery - 60,
-                category, 
-                category_color
-            )
-            self.cartoon_popups.append(popup)
-            
-            # Hit effect (điểm bay lên)
-            self.hit_effects.append({
-                'x': zombie.rect.centerx,
-                'y': zombie.rect.centery,
-                'time': pygame.time.get_ticks(),
-                'score': final_score
-            })
+        # Create cartoon popup for category
+        popup = self.popup_pool.acquire(
+            zombie.rect.centerx, 
+            zombie.rect.centery - 60,
+            category, 
+            category_color
+        )
+        self.cartoon_popups.add(popup)
         
-            audio.play_cherrybomb()
+        # Hit effect (điểm bay lên)
+        self.hit_effects.add({
+            'x': zombie.rect.centerx,
+            'y': zombie.rect.centery,
+            'time': self.game_clock.now,
+            'score': points
+        })
+    
+        self.audio.play_cherrybomb(self.pan_at(zombie.rect.centerx))
 
-    def update_effects(self):
+    def update_effects(self, dt):
         """Cập nhật tất cả các hiệu ứng đang hoạt động."""
-        dt = self.clock.get_time() / 1000.0 # Delta time in seconds
-        
-        # Duyệt qua bản sao của danh sách để có thể xóa phần tử
-        for effect in self.effects[:]:
-            effect.update(dt)
-            if effect.finished:
-                self.effects.remove(effect)
+        self.effects.update(self.step_effect, dt)
+
+    def step_effect(self, effect, dt):
+        effect.update(dt)
+        if effect.finished:
+            self.effect_pools[type(effect)].release(effect)
+            return False
+        return True
 
     def draw_effects(self):
         """Vẽ tất cả các hiệu ứng."""
         for effect in self.effects:
-            effect.draw(self.screen)
-    
-    def update_zombies(self):
-        current_time = pygame.time.get_ticks()
-        game_duration = current_time - self.game_start_time
-        for zombie in self.zombies[:]:
-            zombie.update(game_duration)
-            # Thua khi zombie đi được 80% màn hình (không cần tới sát mép)
-            if zombie.rect.right < int(SCREEN_WIDTH * 0.2) and not zombie.hit:
-                audio.play_eat_sound()
-                self.health -= 1
-                self.misses += 1  # Tính là miss khi zombie vào nhà
-                self.zombies.remove(zombie)
-                self.combo = 0
-            elif zombie.hit and zombie.hit_effect_time <= 0:
-                self.zombies.remove(zombie)
+            self.renderer.mark(effect.draw(self.screen))
     
     def update_hit_effects(self):
-        current_time = pygame.time.get_ticks()
-        self.hit_effects = [effect for effect in self.hit_effects 
-                            if current_time - effect['time'] < 1000]
+        current_time = self.game_clock.now
+        self.hit_effects.update(lambda effect: current_time - effect['time'] < 1000)
     
-    def update_cartoon_popups(self):
+    def update_cartoon_popups(self, dt):
         # Update all cartoon popups and remove expired ones
-        self.cartoon_popups = [popup for popup in self.cartoon_popups if popup.update()]
-    
-    def calculate_final_score(self):
-        total_shots = self.hits + self.misses
-        accuracy = (self.hits / total_shots) if total_shots > 0 else 0
-        
-        end_time = self.game_end_time if self.game_end_time else pygame.time.get_ticks()
-        game_duration = (end_time - self.game_start_time) / 1000
-        
-        time_bonus = int(game_duration * 10)
-        accuracy_bonus = int(self.score * accuracy)
-        combo_bonus = self.max_combo * 50
-        
-        final_score = self.score + time_bonus + accuracy_bonus + combo_bonus
-        return final_score
+        self.cartoon_popups.update(self.step_popup, dt)
+
+    def step_popup(self, popup, dt):
+        if popup.update(dt):
+            return True
+        self.popup_pool.release(popup)
+        return False
+
+    def step(self, dt):
+        """Advance the round by one fixed simulation step of `dt` seconds"""
+        clicks, self.clicks = self.clicks, []
+        if self.replay:
+            clicks = self.replay_clicks.get(self.sim.steps, [])
+        elif self.recording:
+            self.recording.record(self.sim.steps, clicks)
+        for event in self.sim.step(dt, clicks):
+            self.present(event)
+        self.update_hit_effects()
+
+        self.update_effects(dt)
+        self.score_bar.update(dt, self.sim.health)
+
+        self.update_cartoon_popups(dt)
     
+    def get_static_layer(self):
+        """Background with graves baked in, rebuilt only when graves change"""
+        if self.static_layer is None:
+            self.static_layer = self.background_surf.copy()
+            # Draw graves
+            for grave in self.sim.graves:
+                img = self.grave_images[grave['img_idx'] % len(self.grave_images)]
+                rect = img.get_rect(center=(grave['x'], grave['y'] + 30))
+                self.static_layer.blit(img, rect)
+            self.renderer.invalidate()
+        return self.static_layer
+
     def draw_game_background(self):
-        self.screen.blit(self.background_surf, (0, 0))
-        # Draw graves
-        for grave in self.graves:
-            img = self.grave_images[grave['img_idx']]
-            rect = img.get_rect(center=(grave['x'], grave['y'] + 30))
-            self.screen.blit(img, rect)
+        self.screen.blit(self.get_static_layer(), (0, 0))
     
     def draw_game_ui(self):
+        sim = self.sim
         # UI Background
         ui_rect = pygame.Rect(0, 0, SCREEN_WIDTH, 100)
         pygame.draw.rect(self.screen, (0, 0, 0, 128), ui_rect)
+        self.renderer.mark(ui_rect)
         
         # Health bar
         health_bg = pygame.Rect(20, 20, 200, 25)
         pygame.draw.rect(self.screen, RED, health_bg)
         
-        health_fill = pygame.Rect(20, 20, (self.health / INITIAL_HEALTH) * 200, 25)
-        health_color = GREEN if self.health > 10 else ORANGE if self.health > 5 else RED
+        health_fill = pygame.Rect(20, 20, (sim.health / INITIAL_HEALTH) * 200, 25)
+        health_color = GREEN if sim.health > 10 else ORANGE if sim.health > 5 else RED
         pygame.draw.rect(self.screen, health_color, health_fill)
         
-        health_text = self.font_small.render(f"Health: {self.health}/{INITIAL_HEALTH}", True, WHITE)
+        health_text = render_text(self.font_small, f"Health: {sim.health}/{INITIAL_HEALTH}", WHITE)
         self.screen.blit(health_text, (25, 50))
         
         # Score with glow effect
-        score_text = f"Score: {self.score}"
-        score_surface = self.font_medium.render(score_text, True, GOLD)
+        score_text = f"Score: {sim.score}"
+        score_surface = render_text(self.font_medium, score_text, GOLD)
         self.screen.blit(score_surface, (250, 25))
         
         # Combo indicator
-        if self.combo > 0:
-            combo_text = f"COMBO x{self.combo}!"
-            combo_color = YELLOW if self.combo < 5 else ORANGE if self.combo < 10 else RED
-            combo_surface = self.font_medium.render(combo_text, True, combo_color)
+        if sim.combo > 0:
+            combo_text = f"COMBO x{sim.combo}!"
+            combo_color = YELLOW if sim.combo < 5 else ORANGE if sim.combo < 10 else RED
+            combo_surface = render_text(self.font_medium, combo_text, combo_color)
             self.screen.blit(combo_surface, (450, 25))
         
         # Stats
-        stats_text = f"Hits: {self.hits} | Misses: {self.misses} | Max Combo: {self.max_combo}"
-        stats_surface = self.font_small.render(stats_text, True, WHITE)
+        stats_text = f"Hits: {sim.hits} | Misses: {sim.misses} | Max Combo: {sim.max_combo}"
+        stats_surface = render_text(self.font_small, stats_text, WHITE)
         self.screen.blit(stats_surface, (250, 55))
         
         # Game time
-        current_time = pygame.time.get_ticks()
-        game_duration = (current_time - self.game_start_time) / 1000
-        time_text = f"Time: {game_duration:.1f}s"
-        time_surface = self.font_small.render(time_text, True, WHITE)
+        time_text = f"Time: {self.game_clock.seconds:.1f}s"
+        time_surface = render_text(self.font_small, time_text, WHITE)
         self.screen.blit(time_surface, (SCREEN_WIDTH - 150, 25))
     
     def draw_hit_effects(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game_clock.now
         for effect in self.hit_effects:
             time_diff = current_time - effect['time']
             alpha = max(0, 255 - time_diff * 0.5)
@@ -367,300 +435,95 @@ class Game:
                 
                 # Draw only score text (category is now handled by speech bubbles)
                 score_text = f"+{effect['score']}"
-                score_surface = self.font_small.render(score_text, True, GOLD)
+                score_surface = render_text(self.font_small, score_text, GOLD)
                 score_rect = score_surface.get_rect(center=(int(effect['x']), int(effect['y'] - y_offset + 20)))
-                self.screen.blit(score_surface, score_rect)
+                self.renderer.mark(self.screen.blit(score_surface, score_rect))
     
     def draw_cartoon_popups(self):
         for popup in self.cartoon_popups:
-            popup.draw(self.screen, self.font_medium, self.font_small)
-    
-    def draw_game_over(self):
-        audio.stop_grasswalk()
-        audio.stop_looboon()
-        audio.stop_brain_maniac()
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
-        # Game Over text with glow
-        game_over_text = "GAME OVER"
-        shadow = self.font_large.render(game_over_text, True, BLACK)
-        main_text = self.font_large.render(game_over_text, True, RED)
-        text_rect = main_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
-        shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 - 147))
-        self.screen.blit(shadow, shadow_rect)
-        self.screen.blit(main_text, text_rect)
-        # Final score
-        final_score = self.calculate_final_score()
-        score_text = f"Final Score: {final_score}"
-        score_surface = self.font_medium.render(score_text, True, GOLD)
-        score_rect = score_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
-        self.screen.blit(score_surface, score_rect)
-        # Detailed stats
-        total_shots = self.hits + self.misses
-        accuracy = (self.hits / total_shots * 100) if total_shots > 0 else 0
-        game_duration = (self.game_end_time - self.game_start_time) / 1000 if self.game_end_time else 0
-        stats = [
-            f"Zombies Defeated: {self.hits}",
-            f"Shots Missed: {self.misses}",
-            f"Accuracy: {accuracy:.1f}%",
-            f"Max Combo: {self.max_combo}",
-            f"Time Survived: {game_duration:.1f}s"
-        ]
-        for i, stat in enumerate(stats):
-            stat_surface = self.font_small.render(stat, True, WHITE)
-            stat_rect = stat_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20 + i * 25))
-            self.screen.blit(stat_surface, stat_rect)
-        # Save score (only once)
-        if not hasattr(self, 'score_saved'):
-            stats_dict = {
-                'accuracy': accuracy,
-                'max_combo': self.max_combo,
-                'hits': self.hits,
-                'misses': self.misses,
-                'time': game_duration
-            }
-            self.score_manager.save_score(final_score, stats_dict)
-            self.score_saved = True
-        # Draw Retry and Main Menu buttons (đặt thấp xuống)
-        button_w, button_h = 220, 60
-        gap = 30
-        center_x = SCREEN_WIDTH // 2
-        # Đặt nút cách đáy màn hình 60px
-        bottom_margin = 60
-        menu_rect = pygame.Rect(center_x - button_w//2, SCREEN_HEIGHT - bottom_margin - button_h, button_w, button_h)
-        retry_rect = pygame.Rect(center_x - button_w//2, menu_rect.top - gap - button_h, button_w, button_h)
-        pygame.draw.rect(self.screen, (60, 180, 60), retry_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (180, 60, 60), menu_rect, border_radius=12)
-        pygame.draw.rect(self.screen, WHITE, retry_rect, 3, border_radius=12)
-        pygame.draw.rect(self.screen, WHITE, menu_rect, 3, border_radius=12)
-        retry_text = self.font_medium.render("Retry", True, WHITE)
-        menu_text = self.font_medium.render("Main Menu", True, WHITE)
-        self.screen.blit(retry_text, retry_text.get_rect(center=retry_rect.center))
-        self.screen.blit(menu_text, menu_text.get_rect(center=menu_rect.center))
-        return {'retry': retry_rect, 'menu': menu_rect}
-
-    def draw_pause_menu(self):
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-
-        # Pause text
-        pause_text = "PAUSED"
-        shadow = self.font_large.render(pause_text, True, BLACK)
-        main_text = self.font_large.render(pause_text, True, GOLD)
-        text_rect = main_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 120))
-        shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, SCREEN_HEIGHT // 2 - 117))
-        self.screen.blit(shadow, shadow_rect)
-        self.screen.blit(main_text, text_rect)
-
-        # Buttons
-        button_w, button_h = 220, 60
-        gap = 30
-        center_x = SCREEN_WIDTH // 2
-        center_y = SCREEN_HEIGHT // 2
-        resume_rect = pygame.Rect(center_x - button_w//2, center_y - button_h - gap//2, button_w, button_h)
-        menu_rect = pygame.Rect(center_x - button_w//2, center_y + gap//2, button_w, button_h)
-
-        pygame.draw.rect(self.screen, (60, 180, 60), resume_rect, border_radius=12)
-        pygame.draw.rect(self.screen, (180, 60, 60), menu_rect, border_radius=12)
-        pygame.draw.rect(self.screen, WHITE, resume_rect, 3, border_radius=12)
-        pygame.draw.rect(self.screen, WHITE, menu_rect, 3, border_radius=12)
-
-        resume_text = self.font_medium.render("Resume", True, WHITE)
-        menu_text = self.font_medium.render("Main Menu", True, WHITE)
-        self.screen.blit(resume_text, resume_text.get_rect(center=resume_rect.center))
-        self.screen.blit(menu_text, menu_text.get_rect(center=menu_rect.center))
-
-        return {'resume': resume_rect, 'menu': menu_rect}
+            self.renderer.mark(popup.draw(self.screen, self.font_medium, self.font_small))
 
-    def run(self):
-        change_music_0 = False
-        change_music_1 = False
-        running = True
-        groan_count = 0
-        pause_buttons = None
-        gameover_buttons = None
-        while running:
-            dt = self.clock.tick(FPS) / 1000
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        if self.state == "menu":
-                            if self.menu.state == "main":
-                                buttons = self.menu.draw_main_menu()
-                                for button in buttons:
-                                    if button["rect"].collidepoint(event.pos):
-                                        if button["action"] == "play":
-
-                                            audio.play_awooga_sound()
-                                            audio.play_grasswalk()
-                                            audio.stop_looboon()
-                                            audio.stop_brain_maniac()
-                                            audio.stop_background()
-
-                                            self.state = "playing"
-                                            self.reset_game()
-                                        elif button["action"] == "scores":
-                                            self.menu.state = "scores"
-                                        elif button["action"] == "quit":
-                                            running = False
-                            
-                            elif self.menu.state == "scores":
-                                back_rect = self.menu.draw_scores_menu(self.score_manager)
-                                if back_rect.collidepoint(event.pos):
-                                    self.menu.state = "main"
-                        
-                        elif self.state == "playing":
-                            self.handle_click(event.pos)
-                        elif self.state == "paused":
-                            if pause_buttons:
-                                if pause_buttons['resume'].collidepoint(event.pos):
-                                    self.state = "playing"
-                                elif pause_buttons['menu'].collidepoint(event.pos):
-                                    audio.stop_grasswalk()
-                                    audio.stop_looboon()
-                                    audio.stop_brain_maniac()
-                                    audio.play_background()
-                                    self.state = "menu"
-                                    self.menu.state = "main"
-                        elif self.state == "game_over":
-                            if gameover_buttons:
-                                if gameover_buttons['retry'].collidepoint(event.pos):
-                                    audio.stop_grasswalk()
-                                    audio.stop_looboon()
-                                    audio.stop_brain_maniac()
-                                    audio.play_grasswalk()
-                                    self.state = "playing"
-                                    self.reset_game()
-                                    self.score_saved = False
-                                elif gameover_buttons['menu'].collidepoint(event.pos):
-                                    audio.stop_grasswalk()
-                                    audio.stop_looboon()
-                                    audio.stop_brain_maniac()
-                                    audio.play_background()
-                                    self.state = "menu"
-                                    self.menu.state = "main"
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.state == "menu":
-                            running = False
-                        elif self.state == "playing":
-                            self.state = "paused"
-                        elif self.state == "paused":
-                            self.state = "playing"
-                    
-                    elif event.key == pygame.K_r:
-                        if self.state == "game_over":
-                            audio.stop_grasswalk()
-                            audio.stop_looboon()
-                            audio.stop_brain_maniac()
-                            audio.play_grasswalk()
-                            self.state = "playing"
-                            self.reset_game()
-                    
-                    elif event.key == pygame.K_m:
-                        if self.state == "game_over":
-                            audio.stop_grasswalk()
-                            audio.stop_looboon()
-                            audio.stop_brain_maniac()
-                            audio.play_background()
-                            
-                            self.state = "menu"
-                            self.menu.state = "main"
-            
-            # Update game logic
-            if self.state == "playing":
-                if self.health <= 0:
-                    audio.play_losemusic_sound()
-                    audio.play_scream_sound()
-
-                    if not self.game_end_time:
-                        self.game_end_time = pygame.time.get_ticks()
-                    self.state = "game_over"
-                else:
-                    self.spawn_zombie()
-                    self.update_zombies()
-                    self.update_hit_effects()
-
-                    self.update_effects()
-                    self.score_bar.update(dt, self.health)
-
-                    self.update_cartoon_popups()
-
-                    # change music and zombie groaning
-                    current_time = pygame.time.get_ticks()
-                    game_duration = current_time - self.game_start_time
-                    if not change_music_0:
-                        if (game_duration >= 2*DIFFICULTY_INCREASE_INTERVAL):
-                            audio.play_looboon()
-                            audio.stop_grasswalk()
-                            change_music_0 = True
-                    if not change_music_1:
-                        if (game_duration >= 4*DIFFICULTY_INCREASE_INTERVAL):
-                            audio.stop_looboon()
-                            audio.play_brain_maniac()
-                            change_music_1 = True
-                    if game_duration/GROAN_TIME>groan_count:
-                        audio.play_zombie_groan()
-                        groan_count+=1
-            
-            # Draw everything
-            if self.state == "menu":
-                if self.menu.state == "main":
-                    self.menu.draw_main_menu()
-                elif self.menu.state == "scores":
-                    self.menu.draw_scores_menu(self.score_manager)
-            
-            elif self.state == "playing":
-                self.draw_game_background()
-                
-                # Draw zombies
-                for zombie in self.zombies:
-                    zombie.draw(self.screen)
-                
-                self.draw_hit_effects()
+    def draw_zombies(self, alpha):
+        for zombie in self.sim.zombies:
+            self.renderer.mark(zombie.draw(self.screen, self.zombie_frames, alpha))
 
-                self.draw_effects()
-                current_time = pygame.time.get_ticks()
-                game_duration = (current_time - self.game_start_time) / 1000
-                
-                # Gọi draw của score_bar với đủ các tham số
-                self.score_bar.draw(self.screen, self.score, self.health, self.hits, self.misses, self.combo, game_duration)
-                self.draw_cartoon_popups()
-                self.draw_game_ui()
-            
-            elif self.state == "paused":
-                self.draw_game_background()
-                for zombie in self.zombies:
-                    zombie.draw(self.screen)
-                self.draw_hit_effects()
-                self.draw_effects()
-                self.score_bar.draw(self.screen, self.score, self.health, self.hits, self.misses, self.combo, (pygame.time.get_ticks() - self.game_start_time)/1000)
-                self.draw_cartoon_popups()
-                self.draw_game_ui()
-                pause_buttons = self.draw_pause_menu()
-            
-            elif self.state == "game_over":
-                self.draw_game_background()
-                
-                # Draw zombies
-                for zombie in self.zombies:
-                    zombie.draw(self.screen)
-                
-                # sounds
-                self.draw_game_over()
-                gameover_buttons = self.draw_game_over()
+    def draw_playing(self, alpha):
+        """Draw the round, `alpha` of the way from the last simulation step to the next"""
+        # Only restore the regions drawn last frame
+        self.renderer.begin(self.get_static_layer())
+        
+        self.draw_zombies(alpha)
+        
+        self.draw_hit_effects()
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+        self.draw_effects()
+        
+        # Gọi draw của score_bar với đủ các tham số
+        sim = self.sim
+        self.renderer.mark(self.score_bar.draw(self.screen, sim.score, sim.health, sim.hits, sim.misses, sim.combo, self.game_clock.seconds))
+        self.draw_cartoon_popups()
+        self.draw_game_ui()
+
+    def draw_game_scene(self):
+        """The whole round as it stands, untracked (under the pause overlay)"""
+        sim = self.sim
+        self.draw_game_background()
+        for zombie in sim.zombies:
+            zombie.draw(self.screen, self.zombie_frames)
+        self.draw_hit_effects()
+        self.draw_effects()
+        self.score_bar.draw(self.screen, sim.score, sim.health, sim.hits, sim.misses, sim.combo, self.game_clock.seconds)
+        self.draw_cartoon_popups()
+        self.draw_game_ui()
+    
+    def draw_loading_screen(self, progress):
+        self.screen.fill(DARK_GREEN)
+
+        loading_text = self.font_large.render("Loading...", True, WHITE)
+        self.screen.blit(loading_text, loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 60)))
+
+        # Progress bar
+        bar_rect = pygame.Rect(0, 0, 400, 30)
+        bar_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 10)
+        fill_rect = pygame.Rect(bar_rect.left, bar_rect.top, int(bar_rect.width * progress), bar_rect.height)
+        pygame.draw.rect(self.screen, BLACK, bar_rect, border_radius=8)
+        pygame.draw.rect(self.screen, GOLD, fill_rect, border_radius=8)
+        pygame.draw.rect(self.screen, WHITE, bar_rect, 3, border_radius=8)
+
+        percent_text = self.font_small.render(f"{int(progress * 100)}%", True, WHITE)
+        self.screen.blit(percent_text, percent_text.get_rect(center=(SCREEN_WIDTH // 2, bar_rect.bottom + 25)))
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key in (PROFILER_KEY, TRACE_KEY):
+                self.profiler_overlay.handle_key(event.key)
+            else:
+                self.current.handle_event(event)
+
+    def run(self):
+        while self.running:
+            # Render as fast as FPS allows; the playing state advances the
+            # simulation in fixed TIMESTEP steps
+            frame_time = min(self.clock.tick(FPS) / 1000, MAX_FRAME_TIME)
+            self.handle_events()
+
+            # Start the next music track once the old one has faded out
+            self.audio.update()
+            self.current.update(frame_time)
+
+            self.renderer.present(self.profiler_overlay.draw_over(self.current.draw))
+
+            if self.game_asset_keys is None:
+                # The menu is on screen: decode the game assets behind it
+                if 'first_frame' not in self.startup_times:
+                    self.report_startup('first_frame')
+                self.request_game_assets()
+            elif 'game_assets_ready' not in self.startup_times and assets_loader.ready(self.game_asset_keys):
+                self.report_startup('game_assets_ready')
         
+        assets_loader.shutdown()
         pygame.quit()
 
 if __name__ == "__main__":
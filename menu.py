@@ -3,21 +3,35 @@ from settings import *
 from ui.utils import *
 from assets import *
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class BaseBar:
     def __init__(self, image_path, pos=(10, 5)):
+        self.image_path = image_path
         self.image = import_image('assets', 'images', 'menu', image_path, alpha=True)
         self.rect = self.image.get_rect(topleft=pos)
 
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return surface.blit(self.image, self.rect)
+
+    def release(self):
+        release_image('assets', 'images', 'menu', self.image_path, alpha=True)
 
 class StatIcon:
     def __init__(self, image_path, pos, size=(64, 64)):
-        self.image = pygame.transform.scale(import_image('assets', 'images', 'menu', image_path), size)
+        self.image_path = image_path
+        self.size = size
+        self.image = import_image('assets', 'images', 'menu', image_path, scale=size)
         self.rect = self.image.get_rect(midleft=pos)
 
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return surface.blit(self.image, self.rect)
+
+    def release(self):
+        release_image('assets', 'images', 'menu', self.image_path, scale=self.size)
 
 class StatText:
     def __init__(self, font_size=24, color=(255, 255, 255)):
@@ -25,51 +39,64 @@ class StatText:
         self.color = color
 
     def draw(self, surface, value, pos):
-        text = self.font.render(str(value), True, self.color)
+        text = render_text(self.font, value, self.color)
         text_rect = text.get_rect(midleft=pos)
-        surface.blit(text, text_rect)
+        return surface.blit(text, text_rect)
 
 class ScoreDisplay:
     def __init__(self, pos=(31, 26)):
         self.pos_or = pos
         self.font = pygame.font.Font(None, 24)
+        self.background = pygame.Surface((38, 22))
+        self.score = None
 
     def draw(self, surface, score):
-        text_surface = self.font.render(str(score), True, (0, 0, 0))
-        text_rect = text_surface.get_rect()
-        background = pygame.Surface((38, 22))
-        background.fill((252, 248, 228))
-        text_x = (background.get_width() - text_rect.width) // 2
-        text_y = (background.get_height() - text_rect.height) // 2
-        background.blit(text_surface, (text_x, text_y))
-        surface.blit(background, self.pos_or)
+        # Recompose the label only when the score changes
+        if score != self.score:
+            self.score = score
+            text_surface = render_text(self.font, score, (0, 0, 0))
+            text_rect = text_surface.get_rect()
+            background = self.background
+            background.fill((252, 248, 228))
+            text_x = (background.get_width() - text_rect.width) // 2
+            text_y = (background.get_height() - text_rect.height) // 2
+            background.blit(text_surface, (text_x, text_y))
+        return surface.blit(self.background, self.pos_or)
 
 class TimeDisplay:
     def __init__(self, image_path, screen_width, screen_height):
-        icon_size = (64, 64)
-        self.icon = pygame.transform.scale(import_image('assets', 'images', 'menu', image_path), icon_size)
+        self.image_path = image_path
+        self.icon_size = (64, 64)
+        self.icon = import_image('assets', 'images', 'menu', image_path, scale=self.icon_size)
         self.icon_rect = self.icon.get_rect(topright=(screen_width - 70, 15))
         self.text = StatText()
 
+    def release(self):
+        release_image('assets', 'images', 'menu', self.image_path, scale=self.icon_size)
+
     def draw(self, surface, duration):
-        surface.blit(self.icon, self.icon_rect)
+        icon_rect = surface.blit(self.icon, self.icon_rect)
         total_seconds = int(duration)
         minutes = total_seconds // 60
         seconds = total_seconds % 60
         time_str = f"{minutes:02d}:{seconds:02d}"
-        self.text.draw(surface, time_str, (self.icon_rect.right + 5, self.icon_rect.centery))
+        text_rect = self.text.draw(surface, time_str, (self.icon_rect.right + 5, self.icon_rect.centery))
+        return icon_rect.union(text_rect)
 
 class ScoreBar(BaseBar):
+    # Images from assets/images/menu, listed so they can be loaded ahead of time
+    IMAGES = {'background': 'ChooserBackground', 'hit': 'ZombieHead_0', 'miss': 'HDZombieAndBrain', 'time': 'Time_Traveler2'}
+
     def __init__(self, sunflower_frames, sun_frames):
-        super().__init__('ChooserBackground')
+        super().__init__(self.IMAGES['background'])
         self.score = ScoreDisplay((31, self.rect.bottom - 21))
         self.health = 8
         self.flowers = self._init_flowers(sunflower_frames)
-        self.hit_icon = StatIcon('ZombieHead_0', (self.rect.right + 20, self.rect.centery))
-        self.miss_icon = StatIcon('HDZombieAndBrain', (self.hit_icon.rect.right + 70, self.rect.centery))
+        self.hit_icon = StatIcon(self.IMAGES['hit'], (self.rect.right + 20, self.rect.centery))
+        self.miss_icon = StatIcon(self.IMAGES['miss'], (self.hit_icon.rect.right + 70, self.rect.centery))
         self.combo_icon = Sun((self.miss_icon.rect.right + 70, self.rect.centery), sun_frames)
         self.stats_text = StatText()
-        self.time = TimeDisplay('Time_Traveler2', *pygame.display.get_surface().get_size())
+        self.time = TimeDisplay(self.IMAGES['time'], *pygame.display.get_surface().get_size())
 
     def _init_flowers(self, frames):
         flowers = []
@@ -79,40 +106,72 @@ class ScoreBar(BaseBar):
             flowers.append(SunFlower((x, y), frames))
         return flowers
 
+    def release(self):
+        """Give back the bar's images; the flower and sun frames belong to the caller"""
+        super().release()
+        self.hit_icon.release()
+        self.miss_icon.release()
+        self.time.release()
+
     def update(self, dt, health):
         for i in range(min(health, self.health)):
             self.flowers[i].update(dt)
         self.combo_icon.update(dt)
 
     def draw(self, surface, score, health, hits, misses, combo, duration):
-        super().draw(surface)
-        self.score.draw(surface, score)
+        """Draw the bar and return the bounding rect of everything drawn"""
+        rects = [super().draw(surface)]
+        rects.append(self.score.draw(surface, score))
         for i in range(min(health, self.health)):
-            self.flowers[i].draw(surface)
-        self.hit_icon.draw(surface)
-        self.stats_text.draw(surface, hits, (self.hit_icon.rect.right + 5, self.hit_icon.rect.centery))
-        self.miss_icon.draw(surface)
-        self.stats_text.draw(surface, misses, (self.miss_icon.rect.right + 5, self.miss_icon.rect.centery))
+            rects.append(self.flowers[i].draw(surface))
+        rects.append(self.hit_icon.draw(surface))
+        rects.append(self.stats_text.draw(surface, hits, (self.hit_icon.rect.right + 5, self.hit_icon.rect.centery)))
+        rects.append(self.miss_icon.draw(surface))
+        rects.append(self.stats_text.draw(surface, misses, (self.miss_icon.rect.right + 5, self.miss_icon.rect.centery)))
         if combo > 0:
-            self.combo_icon.draw(surface)
-            self.stats_text.draw(surface, f"x{combo}", (self.combo_icon.rect.right + 5, self.combo_icon.rect.centery))
-        self.time.draw(surface, duration)
+            rects.append(self.combo_icon.draw(surface))
+            rects.append(self.stats_text.draw(surface, f"x{combo}", (self.combo_icon.rect.right + 5, self.combo_icon.rect.centery)))
+        rects.append(self.time.draw(surface, duration))
+        return rects[0].unionall(rects[1:])
 
 class Menu:
+    # Menu buttons
+    BUTTONS = [
+        {"text": "PLAY GAME", "y": 350, "color": GREEN, "action": "play"},
+        {"text": "HIGH SCORES", "y": 420, "color": BLUE, "action": "scores"},
+        {"text": "QUIT", "y": 490, "color": RED, "action": "quit"}
+    ]
+
     def __init__(self, screen, font_large, font_medium, font_small):
         self.screen = screen
         self.font_large = font_large
         self.font_medium = font_medium
         self.font_small = font_small
-        self.state = "main"  # main, scores
-        
-    def draw_main_menu(self):
-        for y in range(SCREEN_HEIGHT):
-            color_ratio = y / SCREEN_HEIGHT
-            r = int(25 + color_ratio * 30)
-            g = int(25 + color_ratio * 100)
-            b = int(50 + color_ratio * 50)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+
+        # Cached main menu layers, built on first draw
+        self.background = None
+        self.buttons = None
+        self.hovered = None
+        self.needs_redraw = True
+
+    def invalidate(self):
+        """Redraw the whole main menu next time (something else drew over it)"""
+        self.needs_redraw = True
+
+    def build_background(self):
+        """Vertical gradient with the title baked in"""
+        if np is not None:
+            ratio = np.arange(SCREEN_HEIGHT) / SCREEN_HEIGHT
+            column = np.stack([25 + ratio * 30, 25 + ratio * 100, 50 + ratio * 50], axis=1).astype(np.uint8)
+            background = pygame.surfarray.make_surface(np.broadcast_to(column, (SCREEN_WIDTH, SCREEN_HEIGHT, 3)).copy())
+        else:
+            background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            for y in range(SCREEN_HEIGHT):
+                color_ratio = y / SCREEN_HEIGHT
+                r = int(25 + color_ratio * 30)
+                g = int(25 + color_ratio * 100)
+                b = int(50 + color_ratio * 50)
+                pygame.draw.line(background, (r, g, b), (0, y), (SCREEN_WIDTH, y))
         
         # Game title with shadow effect
         title_text = "WHACK A ZOMBIE"
@@ -122,35 +181,62 @@ class Menu:
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, 150))
         shadow_rect = shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, 153))
         
-        self.screen.blit(shadow, shadow_rect)
-        self.screen.blit(title, title_rect)
+        background.blit(shadow, shadow_rect)
+        background.blit(title, title_rect)
+        return background.convert()
+
+    def build_button_surface(self, text, color, size):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+        pygame.draw.rect(surface, color, rect, border_radius=10)
+        pygame.draw.rect(surface, WHITE, rect, 3, border_radius=10)
         
-        # Menu buttons
-        buttons = [
-            {"text": "PLAY GAME", "y": 350, "color": GREEN, "action": "play"},
-            {"text": "HIGH SCORES", "y": 420, "color": BLUE, "action": "scores"},
-            {"text": "QUIT", "y": 490, "color": RED, "action": "quit"}
-        ]
+        # Button text
+        text_surface = self.font_medium.render(text, True, WHITE)
+        surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return surface
+
+    def get_buttons(self):
+        """Button dicts with their rects and pre-rendered normal/hover surfaces"""
+        if self.buttons is None:
+            self.buttons = []
+            for button in self.BUTTONS:
+                button = dict(button)
+                button["rect"] = pygame.Rect(SCREEN_WIDTH // 2 - 150, button["y"] - 25, 300, 50)
+                hover_color = tuple(min(255, c + 50) for c in button["color"])
+                button["normal"] = self.build_button_surface(button["text"], button["color"], button["rect"].size)
+                button["hover"] = self.build_button_surface(button["text"], hover_color, button["rect"].size)
+                self.buttons.append(button)
+        return self.buttons
+
+    def draw_main_menu(self):
+        """Draw what changed on the main menu and return the dirty rects"""
+        if self.background is None:
+            self.background = self.build_background()
+        buttons = self.get_buttons()
         
         mouse_pos = pygame.mouse.get_pos()
-        
-        for button in buttons:
-            # Button background with hover effect
-            button_rect = pygame.Rect(SCREEN_WIDTH // 2 - 150, button["y"] - 25, 300, 50)
-            hover = button_rect.collidepoint(mouse_pos)
-            
-            button_color = button["color"] if not hover else tuple(min(255, c + 50) for c in button["color"])
-            pygame.draw.rect(self.screen, button_color, button_rect, border_radius=10)
-            pygame.draw.rect(self.screen, WHITE, button_rect, 3, border_radius=10)
-            
-            # Button text
-            text_surface = self.font_medium.render(button["text"], True, WHITE)
-            text_rect = text_surface.get_rect(center=button_rect.center)
-            self.screen.blit(text_surface, text_rect)
-            
-            button["rect"] = button_rect
-        
-        return buttons
+        hovered = None
+        for i, button in enumerate(buttons):
+            if button["rect"].collidepoint(mouse_pos):
+                hovered = i
+
+        dirty = []
+        if self.needs_redraw:
+            self.screen.blit(self.background, (0, 0))
+            dirty.append(self.screen.get_rect())
+
+        # Only the buttons whose hover state changed are redrawn
+        for i, button in enumerate(buttons):
+            if self.needs_redraw or (i == hovered) != (i == self.hovered):
+                rect = button["rect"]
+                self.screen.blit(self.background, rect, rect)
+                self.screen.blit(button["hover"] if i == hovered else button["normal"], rect)
+                dirty.append(rect)
+
+        self.hovered = hovered
+        self.needs_redraw = False
+        return dirty
     
     def draw_scores_menu(self, score_manager):
         # Background
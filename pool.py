@@ -0,0 +1,45 @@
+"""
+Object pools for short-lived game objects.
+
+Zombies, effects and popups live for about a second each, so at high spawn
+rates allocating them fresh drives GC pauses. Pooled classes implement
+reset(*args) with the same arguments as their constructor; acquire() reuses
+a released instance through reset() when one is available.
+"""
+
+
+class ObjectPool:
+    def __init__(self, cls, max_free=256):
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+
+        # Counters
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0  # allocations avoided
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        self.in_use += 1
+        return obj
+
+    def release(self, obj):
+        """Give `obj` back; the caller must not keep using it"""
+        self.in_use -= 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def stats(self):
+        return {
+            'in_use': self.in_use,
+            'free': len(self.free),
+            'created': self.created,
+            'reused': self.reused,
+        }
@@ -7,6 +7,7 @@ specifically the cartoon-style 3D text effects used for hit feedback.
 
 import pygame
 import math
+from collections import OrderedDict
 
 # Color constants (copied from main for independence)
 WHITE = (255, 255, 255)
@@ -16,6 +17,115 @@ GOLD = (255, 215, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 
+DEPTH_LAYERS = 6
+
+disk_masks = {}
+
+
+def get_disk_mask(radius):
+    """Return a cached filled-circle mask of the given radius"""
+    mask = disk_masks.get(radius)
+    if mask is None:
+        size = radius * 2 + 1
+        mask = pygame.mask.Mask((size, size))
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if dx*dx + dy*dy <= radius*radius:
+                    mask.set_at((dx + radius, dy + radius))
+        disk_masks[radius] = mask
+    return mask
+
+
+def build_outline(surface, thickness, color):
+    """
+    Build a solid outline of `surface` grown by `thickness` pixels.
+
+    The glyph mask is convolved with a disk mask, which is the same union
+    of every (dx, dy) offset inside the circle that the old per-offset
+    blit loop produced. The result is `thickness` pixels larger on every
+    side than `surface`.
+    """
+    outline_mask = pygame.mask.from_surface(surface).convolve(get_disk_mask(thickness))
+    return outline_mask.to_surface(setcolor=color + (255,), unsetcolor=(0, 0, 0, 0))
+
+
+def tint_surface(surface, color):
+    """Return a copy of a white surface multiplied by `color`, keeping its alpha"""
+    tinted = surface.copy()
+    tinted.fill(color + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
+
+
+class PopupSpriteCache:
+    """
+    Bounded LRU cache of fully composited popup sprites.
+
+    Each sprite holds the depth layers, the black outline and the gradient
+    passes rendered once at scale 1.0 with no rotation, so drawing a popup
+    costs a single rotate/scale per frame instead of ~90 font renders.
+    Sprites are padded evenly on all sides so the text center is the
+    sprite center, which keeps rotation around the right point.
+    """
+
+    def __init__(self, max_size=32, font_size=48):
+        self.max_size = max_size
+        self.font_size = font_size
+        self.font = None
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, self.font_size)
+        return self.font
+
+    def get(self, text, category_color, outline_thickness, font, colors):
+        key = (text, category_color, outline_thickness)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self.build(font, text, colors, outline_thickness)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_size:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def build(self, font, text, colors, outline_thickness):
+        # Render the glyphs once in white; every layer is a tinted copy or
+        # derived from its mask, so the cost no longer depends on thickness.
+        text_surface = font.render(text, True, WHITE)
+        width, height = text_surface.get_size()
+        pad = max(DEPTH_LAYERS * 2, outline_thickness, len(colors) - 1)
+        sprite = pygame.Surface((width + pad * 2, height + pad * 2), pygame.SRCALPHA)
+
+        # Depth layers (back to front)
+        for depth in range(DEPTH_LAYERS, 0, -1):
+            depth_color = (max(0, colors[2][0] - depth * 20),
+                           max(0, colors[2][1] - depth * 20),
+                           max(0, colors[2][2] - depth * 20))
+            sprite.blit(tint_surface(text_surface, depth_color), (pad + depth * 2, pad + depth * 2))
+
+        # Thick black outline: dilate the glyph mask by a disk in one pass
+        outline_surface = build_outline(text_surface, outline_thickness, BLACK)
+        sprite.blit(outline_surface, (pad - outline_thickness, pad - outline_thickness))
+
+        # Main gradient text (simulate gradient with multiple colors)
+        for i, color in enumerate(colors):
+            sprite.blit(tint_surface(text_surface, color), (pad - i, pad - i))
+
+        return sprite
+
+    def clear(self):
+        self.sprites.clear()
+
+
+popup_sprite_cache = PopupSpriteCache()
+
 
 class CartoonPopupText:
     """
@@ -29,31 +139,39 @@ class CartoonPopupText:
     - Pop-out shrink exit animation
     """
     
-    def __init__(self, x, y, text, category_color):
+    # Slotted and resettable so popups can be recycled through an ObjectPool
+    __slots__ = ('x', 'y', 'original_y', 'text', 'category_color', 'elapsed', 'lifetime',
+                 'scale', 'target_scale', 'bounce_phase', 'rotation')
+
+    # Color gradients for each category (shared by all popups)
+    gradients = {
+        GOLD: [(255, 255, 100), (255, 215, 0), (255, 165, 0)],  # Perfect - Gold gradient
+        GREEN: [(144, 238, 144), (0, 255, 0), (0, 200, 0)],      # Great - Green gradient  
+        BLUE: [(173, 216, 230), (0, 191, 255), (0, 100, 255)],   # Good - Blue gradient
+        WHITE: [(255, 255, 255), (230, 230, 230), (200, 200, 200)]  # Not Bad - White gradient
+    }
+
+    def __init__(self, *args):
+        self.reset(*args)
+
+    def reset(self, x, y, text, category_color):
         self.x = x
         self.y = y
         self.original_y = y
         self.text = text
         self.category_color = category_color
-        self.spawn_time = pygame.time.get_ticks()
+        self.elapsed = 0.0
         self.lifetime = 1200  # 1.5 seconds
         self.scale = 0.0
         self.target_scale = 1.2
         self.bounce_phase = 0.0
         self.rotation = 0.0
         
-        # Color gradients for each category
-        self.gradients = {
-            GOLD: [(255, 255, 100), (255, 215, 0), (255, 165, 0)],  # Perfect - Gold gradient
-            GREEN: [(144, 238, 144), (0, 255, 0), (0, 200, 0)],      # Great - Green gradient  
-            BLUE: [(173, 216, 230), (0, 191, 255), (0, 100, 255)],   # Good - Blue gradient
-            WHITE: [(255, 255, 255), (230, 230, 230), (200, 200, 200)]  # Not Bad - White gradient
-        }
-        
-    def update(self):
-        """Update animation state and return True if still alive"""
-        current_time = pygame.time.get_ticks()
-        elapsed = current_time - self.spawn_time
+    def update(self, dt):
+        """Advance animation by `dt` simulated seconds and return True if still alive"""
+        self.elapsed += dt * 1000
+        elapsed = self.elapsed
+        steps = dt * 60  # per-step amounts below were tuned at 60 steps/s
         
         # Animation phases
         if elapsed < 200:  # First 0.2 seconds - explosive entrance
@@ -62,13 +180,13 @@ class CartoonPopupText:
             self.rotation = math.sin(progress * math.pi * 4) * 10  # Wobble effect
         elif elapsed < self.lifetime - 300:  # Middle phase - stable with gentle bob
             self.scale = self.target_scale
-            self.bounce_phase += 0.15
+            self.bounce_phase += 0.15 * steps
             self.y = self.original_y - 20 + math.sin(self.bounce_phase) * 3
             self.rotation = math.sin(self.bounce_phase * 0.5) * 2
         else:  # Last 0.3 seconds - pop-out shrink
             fade_progress = (elapsed - (self.lifetime - 300)) / 300.0
             self.scale = self.target_scale * (1.0 - fade_progress)  # Shrink to 0
-            self.y -= 1.0  # Gentle float upward
+            self.y -= 1.0 * steps  # Gentle float upward
             self.rotation = 0  # No rotation during exit
         
         return elapsed < self.lifetime
@@ -83,87 +201,30 @@ class CartoonPopupText:
         """Draw 3D cartoon text with thick outlines and gradient"""
         if self.scale <= 0:
             return
-            
-        # Create multiple layers for 3D depth effect
-        depth_layers = 6
-        
-        # Draw depth layers (back to front)
-        for depth in range(depth_layers, 0, -1):
-            depth_color = (max(0, colors[2][0] - depth * 20), 
-                          max(0, colors[2][1] - depth * 20), 
-                          max(0, colors[2][2] - depth * 20))
-            
-            offset_x = depth * 2
-            offset_y = depth * 2
-            
-            # Create text surface
-            text_surface = font.render(text, True, depth_color)
-            
-            # Apply rotation if any
-            if abs(self.rotation) > 0.1:
-                text_surface = pygame.transform.rotate(text_surface, self.rotation)
-            
-            # Scale the text
-            if self.scale != 1.0:
-                scaled_width = max(1, int(text_surface.get_width() * self.scale))
-                scaled_height = max(1, int(text_surface.get_height() * self.scale))
-                text_surface = pygame.transform.scale(text_surface, (scaled_width, scaled_height))
-            
-            # Position with depth offset
-            final_x = x - text_surface.get_width() // 2 + offset_x
-            final_y = y - text_surface.get_height() // 2 + offset_y
-            
-            screen.blit(text_surface, (final_x, final_y))
-        
-        # Draw main text with thick black outline
-        main_font = font
-        
-        # Draw thick black outline
-        for dx in range(-outline_thickness, outline_thickness + 1):
-            for dy in range(-outline_thickness, outline_thickness + 1):
-                if dx*dx + dy*dy <= outline_thickness*outline_thickness:
-                    outline_surface = main_font.render(text, True, BLACK)
-                    
-                    if abs(self.rotation) > 0.1:
-                        outline_surface = pygame.transform.rotate(outline_surface, self.rotation)
-                    
-                    if self.scale != 1.0:
-                        scaled_width = max(1, int(outline_surface.get_width() * self.scale))
-                        scaled_height = max(1, int(outline_surface.get_height() * self.scale))
-                        outline_surface = pygame.transform.scale(outline_surface, (scaled_width, scaled_height))
-                    
-                    outline_x = x - outline_surface.get_width() // 2 + dx
-                    outline_y = y - outline_surface.get_height() // 2 + dy
-                    screen.blit(outline_surface, (outline_x, outline_y))
-        
-        # Draw main gradient text (simulate gradient with multiple colors)
-        for i, color in enumerate(colors):
-            main_surface = main_font.render(text, True, color)
-            
-            if abs(self.rotation) > 0.1:
-                main_surface = pygame.transform.rotate(main_surface, self.rotation)
-            
-            if self.scale != 1.0:
-                scaled_width = max(1, int(main_surface.get_width() * self.scale))
-                scaled_height = max(1, int(main_surface.get_height() * self.scale))
-                main_surface = pygame.transform.scale(main_surface, (scaled_width, scaled_height))
-            
-            # Slight offset for gradient effect
-            main_x = x - main_surface.get_width() // 2 - i
-            main_y = y - main_surface.get_height() // 2 - i
-            screen.blit(main_surface, (main_x, main_y))
-    
+
+        sprite = popup_sprite_cache.get(text, self.category_color, outline_thickness, font, colors)
+
+        # Only one transform per frame on the pre-composited sprite
+        if abs(self.rotation) > 0.1:
+            sprite = pygame.transform.rotozoom(sprite, self.rotation, self.scale)
+        elif self.scale != 1.0:
+            scaled_width = max(1, int(sprite.get_width() * self.scale))
+            scaled_height = max(1, int(sprite.get_height() * self.scale))
+            sprite = pygame.transform.scale(sprite, (scaled_width, scaled_height))
+
+        return screen.blit(sprite, sprite.get_rect(center=(x, y)))
+
     def draw(self, screen, font_medium, font_small):
         """Draw the cartoon popup text effect"""
         if self.scale <= 0:
             return
         
         # Use larger font for cartoon effect
-        big_font = pygame.font.Font(None, 48)
+        big_font = popup_sprite_cache.get_font()
         
         # Get gradient colors for this category
         gradient_colors = self.gradients.get(self.category_color, self.gradients[WHITE])
         
         # Draw 3D cartoon text (no background burst)
-        self.draw_3d_text(screen, big_font, self.text, int(self.x), int(self.y), 
-                         gradient_colors, outline_thickness=5)
\ No newline at end of file
+        return self.draw_3d_text(screen, big_font, self.text, int(self.x), int(self.y), 
+                         gradient_colors, outline_thickness=5)
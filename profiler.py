@@ -0,0 +1,156 @@
+"""
+Per-phase timing for the hot paths.
+
+A Profiler times named phases of a frame. instrument() swaps a method on
+one object for a timed wrapper (an instance attribute that shadows the
+class method) and restore() takes the wrappers off again, so code that
+is not being profiled runs the plain methods at no cost. phase() times a
+block of code inline.
+
+    profiler = Profiler()
+    profiler.instrument(game.sim, 'update_zombies')
+    profiler.instrument(game.score_bar, 'draw', 'ScoreBar.draw')
+    with profiler.phase('frame'):
+        ...
+    profiler.summary()  # {phase: {'count', 'mean', 'p50', 'p90', 'p99', 'max'}} in ms
+    profiler.restore()
+
+FrameProfiler is the running game's version (see profiler_overlay.py): it
+keeps the phase times of the last frames and the calls of the last few
+seconds, which trace() turns into Chrome trace events for
+chrome://tracing or https://ui.perfetto.dev.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+MISSING = object()
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of `values` (0 <= p <= 100)"""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+class Profiler:
+    def __init__(self):
+        self.samples = {}  # phase: [ms, ...] in call order
+        self.wrapped = []  # (object, attribute, what it held before), in wrapping order
+
+    def instrument(self, obj, attribute, phase=None):
+        """
+        Time every call of obj.attribute as `phase` (default: the attribute
+        name), or as phase(*args) when it is a function of the call's arguments
+        """
+        method = getattr(obj, attribute)
+        phase = phase or attribute
+        named = callable(phase)
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(phase(*args, **kwargs) if named else phase, start, perf_counter())
+
+        self.wrapped.append((obj, attribute, vars(obj).get(attribute, MISSING)))
+        setattr(obj, attribute, timed)
+
+    def restore(self):
+        """Take every wrapper off again, newest first"""
+        for obj, attribute, previous in reversed(self.wrapped):
+            if previous is MISSING:
+                delattr(obj, attribute)
+            else:
+                setattr(obj, attribute, previous)
+        self.wrapped.clear()
+
+    def record(self, phase, start, end):
+        """One call of `phase` from `start` to `end` (perf_counter seconds)"""
+        self.samples.setdefault(phase, []).append((end - start) * 1000)
+
+    @contextmanager
+    def phase(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, perf_counter())
+
+    def clear(self):
+        for times in self.samples.values():
+            times.clear()
+
+    def summary(self):
+        """Percentiles of every phase that ran, in ms"""
+        return {phase: {'count': len(times), 'mean': sum(times) / len(times), 'p50': percentile(times, 50),
+                        'p90': percentile(times, 90), 'p99': percentile(times, 99), 'max': max(times)}
+                for phase, times in self.samples.items() if times}
+
+
+class FrameProfiler(Profiler):
+    """
+    Phase times per frame for the last `history` frames, and every timed
+    call of the last `trace_seconds` for trace().
+    """
+
+    def __init__(self, history=240, trace_seconds=10):
+        super().__init__()
+        self.frames = deque(maxlen=history)  # {phase: ms spent in it during the frame, 'frame': frame time}
+        self.current = {}
+        self.frame_start = None
+        self.trace_seconds = trace_seconds
+        self.calls = deque()  # (phase, start, end), in the order they finished
+        self.counters = deque()  # (time, {name: value}) once per frame
+        self.origin = perf_counter()
+
+    def record(self, phase, start, end):
+        self.current[phase] = self.current.get(phase, 0) + (end - start) * 1000
+        self.calls.append((phase, start, end))
+
+    def end_frame(self, counters=None):
+        """Close the frame that started at the last end_frame()"""
+        now = perf_counter()
+        if self.frame_start is not None:
+            self.current['frame'] = (now - self.frame_start) * 1000
+            self.calls.append(('frame', self.frame_start, now))
+            self.frames.append(self.current)
+        if counters:
+            self.counters.append((now, counters))
+        self.current = {}
+        self.frame_start = now
+
+        # Keep only the last trace_seconds for trace()
+        cutoff = now - self.trace_seconds
+        while self.calls and self.calls[0][2] < cutoff:
+            self.calls.popleft()
+        while self.counters and self.counters[0][0] < cutoff:
+            self.counters.popleft()
+
+    def averages(self):
+        """Mean ms per frame of every phase over the recorded frames"""
+        totals = {}
+        for frame in self.frames:
+            for phase, ms in frame.items():
+                totals[phase] = totals.get(phase, 0) + ms
+        return {phase: total / len(self.frames) for phase, total in totals.items()}
+
+    def trace(self):
+        """The recorded calls as a Chrome trace-event document"""
+        def us(t):
+            return (t - self.origin) * 1e6
+
+        # Frames overlap the calls that end them, so they get a track of their own
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'main loop'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'frames'}},
+        ]
+        for phase, start, end in self.calls:
+            events.append({'name': phase, 'ph': 'X', 'pid': 1, 'tid': 2 if phase == 'frame' else 1,
+                           'ts': us(start), 'dur': us(end) - us(start)})
+        for time, counters in self.counters:
+            events.append({'name': 'entities', 'ph': 'C', 'pid': 1, 'ts': us(time), 'args': counters})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
@@ -0,0 +1,225 @@
+"""
+In-game profiler overlay.
+
+PROFILER_KEY (F3) shows or hides a panel with the FPS, a graph of the last
+frame times against the frame budget, the mean ms per frame spent in each
+phase of the main loop and the entity counts. While it is up, TRACE_KEY
+(F4) saves the last TRACE_SECONDS of phase calls as a Chrome trace-event
+file in TRACE_DIR; open it in chrome://tracing or https://ui.perfetto.dev
+to see which calls made a frame stutter.
+
+The phases are timed by instrumenting the game's methods only while the
+panel is up (see profiler.py). Hiding it takes the wrappers off again, so
+a hidden overlay costs the main loop one method call per frame. Timer
+callbacks are timed where the scheduler fires them, each under its own
+name, since the timers themselves hold the callbacks. The score bar is
+built by Game.load_assets, which hands it to the overlay every time.
+"""
+
+import json
+import os
+from datetime import datetime
+
+from settings import *
+
+from profiler import FrameProfiler
+
+# The main loop's phases in call order, with how deep they are nested
+PHASES = (
+    ('events', 0),
+    ('update', 0),
+    ('step', 1),
+    ('timers', 2),
+    ('spawn_zombie', 3),
+    ('kill', 3),
+    ('update_zombies', 2),
+    ('update_effects', 1),
+    ('update_cartoon_popups', 1),
+    ('draw', 0),
+    ('draw_main_menu', 1),
+    ('draw_background', 1),
+    ('draw_zombies', 1),
+    ('draw_hit_effects', 1),
+    ('draw_effects', 1),
+    ('ScoreBar.draw', 1),
+    ('draw_cartoon_popups', 1),
+    ('draw_game_ui', 1),
+    ('present', 0),
+    ('overlay', 0),
+)
+PANEL_WIDTH = 300
+PADDING = 8
+LINE_HEIGHT = 16
+GRAPH_HEIGHT = 60
+GRAPH_MS = 50  # frame time at the top of the graph
+TEXT_INTERVAL = 250  # ms between text refreshes, so the numbers stay readable
+
+
+def timer_name(timer):
+    if timer.callback.__name__ == 'append':
+        # A timer that only queues a simulation event, named after the event
+        return timer.args[0][0]
+    return timer.callback.__name__
+
+
+class ProfilerOverlay:
+    def __init__(self, game):
+        self.game = game
+        self.visible = False
+        self.profiler = None  # kept after hiding so the last trace can still be saved
+        self.font = pygame.font.Font(None, 20)
+        self.rect = None  # where the panel is on screen
+        self.under = None  # what the panel covers
+        self.text = None
+        self.text_time = 0
+        self.shade = None
+
+    def handle_key(self, key):
+        if key == PROFILER_KEY:
+            self.toggle()
+        elif key == TRACE_KEY:
+            self.save_trace()
+
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.profiler = FrameProfiler(PANEL_WIDTH - 2 * PADDING, TRACE_SECONDS)
+            self.instrument()
+            self.text = None
+        else:
+            self.profiler.restore()
+
+    def instrument(self):
+        game = self.game
+        profiler = self.profiler
+        profiler.instrument(game, 'handle_events', 'events')
+        for state in game.states.values():
+            profiler.instrument(state, 'update')
+            profiler.instrument(state, 'draw')
+        profiler.instrument(game, 'step')
+        profiler.instrument(game.sim.scheduler, 'update', 'timers')
+        profiler.instrument(game.sim.scheduler, 'fire', timer_name)
+        profiler.instrument(game.sim, 'update_zombies')
+        profiler.instrument(game, 'update_effects')
+        profiler.instrument(game, 'update_cartoon_popups')
+        profiler.instrument(game.menu, 'draw_main_menu')
+        profiler.instrument(game.renderer, 'begin', 'draw_background')
+        profiler.instrument(game, 'draw_zombies')
+        profiler.instrument(game, 'draw_hit_effects')
+        profiler.instrument(game, 'draw_effects')
+        profiler.instrument(game, 'draw_cartoon_popups')
+        profiler.instrument(game, 'draw_game_ui')
+        profiler.instrument(game.renderer, 'present')
+        if game.assets_loaded:
+            self.instrument_assets()
+
+    def instrument_assets(self):
+        """Time the objects Game.load_assets builds"""
+        self.profiler.instrument(self.game.score_bar, 'draw', 'ScoreBar.draw')
+
+    def game_assets_loaded(self):
+        """Called by Game.load_assets: the score bar is a new object to time"""
+        if self.visible:
+            self.instrument_assets()
+
+    def counts(self):
+        game = self.game
+        return {'zombies': len(game.sim.zombies), 'effects': len(game.effects),
+                'popups': len(game.cartoon_popups), 'hit_effects': len(game.hit_effects)}
+
+    def draw_over(self, draw):
+        """Run the current state's draw() with the panel on top; returns the rects for the renderer"""
+        if not self.visible and self.rect is None:
+            return draw()
+
+        # Put back what the panel covered, so the state draws onto its own frame
+        erased, self.rect = self.rect, None
+        if erased:
+            self.game.screen.blit(self.under, erased)
+        rects = draw()
+        if not self.visible:
+            return self.include(rects, erased)
+
+        self.profiler.end_frame(self.counts())
+        with self.profiler.phase('overlay'):
+            rect = self.draw_panel()
+        return self.include(rects, rect)
+
+    def include(self, rects, rect):
+        """Add the panel's rect to what the renderer pushes this frame"""
+        renderer = self.game.renderer
+        if renderer.tracking:
+            renderer.mark(rect)
+            return rects
+        if rects is None:
+            return None
+        return list(rects) + [rect]
+
+    def draw_panel(self):
+        screen = self.game.screen
+        now = pygame.time.get_ticks()
+        if self.text is None or now - self.text_time >= TEXT_INTERVAL:
+            self.text = self.render_text()
+            self.text_time = now
+
+        height = self.text.get_height() + GRAPH_HEIGHT + 3 * PADDING
+        rect = pygame.Rect(SCREEN_WIDTH - PANEL_WIDTH - 10, SCREEN_HEIGHT - height - 10, PANEL_WIDTH, height)
+        if self.shade is None or self.shade.get_size() != rect.size:
+            self.shade = pygame.Surface(rect.size)
+            self.shade.set_alpha(200)
+            self.shade.fill(BLACK)
+        self.under = screen.subsurface(rect).copy()
+        self.rect = rect
+
+        screen.blit(self.shade, rect)
+        screen.blit(self.text, (rect.x + PADDING, rect.y + PADDING))
+        graph = pygame.Rect(rect.x + PADDING, rect.bottom - PADDING - GRAPH_HEIGHT, PANEL_WIDTH - 2 * PADDING, GRAPH_HEIGHT)
+        self.draw_graph(screen, graph)
+        return rect
+
+    def render_text(self):
+        profiler = self.profiler
+        averages = profiler.averages()
+        worst = max((frame['frame'] for frame in profiler.frames), default=0)
+        frame = averages.get('frame', 0)
+        counts = self.counts()
+        rows = [
+            (f"FPS {1000 / frame if frame else 0:.0f}   frame {frame:.1f} ms, worst {worst:.1f} ms", None, WHITE),
+            (f"zombies {counts['zombies']}  effects {counts['effects']}  "
+             f"popups {counts['popups']}  hit effects {counts['hit_effects']}", None, WHITE),
+            ("phase", "ms/frame", GRAY),
+        ]
+        for phase, depth in PHASES:
+            ms = averages.get(phase, 0)
+            rows.append(("  " * depth + phase, f"{ms:.2f}", YELLOW if ms >= 1 else WHITE))
+
+        text = pygame.Surface((PANEL_WIDTH - 2 * PADDING, len(rows) * LINE_HEIGHT), pygame.SRCALPHA)
+        for i, (label, value, color) in enumerate(rows):
+            y = i * LINE_HEIGHT
+            text.blit(self.font.render(label, True, color), (0, y))
+            if value is not None:
+                value_surface = self.font.render(value, True, color)
+                text.blit(value_surface, value_surface.get_rect(topright=(text.get_width(), y)))
+        return text
+
+    def draw_graph(self, screen, graph):
+        """Frame times, newest on the right, with the frame budget as a line"""
+        def y_at(ms):
+            return graph.bottom - min(ms, GRAPH_MS) / GRAPH_MS * graph.height
+
+        budget = y_at(1000 / FPS)
+        pygame.draw.line(screen, GREEN, (graph.left, budget), (graph.right - 1, budget))
+        times = [frame['frame'] for frame in self.profiler.frames]
+        if len(times) > 1:
+            left = graph.right - len(times)
+            pygame.draw.lines(screen, YELLOW, False, [(left + i, y_at(ms)) for i, ms in enumerate(times)])
+
+    def save_trace(self):
+        if self.profiler is None or not self.profiler.calls:
+            print("Nothing to trace yet: show the profiler overlay first")
+            return
+        os.makedirs(TRACE_DIR, exist_ok=True)
+        path = os.path.join(TRACE_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + ".trace.json")
+        with open(path, 'w') as f:
+            json.dump(self.profiler.trace(), f)
+        print(f"Trace of the last {TRACE_SECONDS} s saved to {path}")
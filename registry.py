@@ -0,0 +1,163 @@
+"""
+Central asset registry for surfaces.
+
+Every image the game draws is acquired here, keyed by (path, scale, alpha),
+so a file is decoded once and every user shares the same surface; scaled
+variants are made once from the shared original and cached too. Entries
+count their references: acquire with image() and give back with release().
+Unreferenced entries stay cached for the next user, and are evicted least
+recently used first once the total goes over the memory budget
+(settings.ASSET_MEMORY_BUDGET unless one is given). Referenced
+entries are never evicted, so the budget can be exceeded by what is in use.
+
+Decoding goes through the asset loader (see loader.py); request() starts it
+in the background ahead of the first image() call.
+"""
+
+from collections import OrderedDict
+from os.path import basename, dirname, normpath
+
+import pygame
+
+from bundle import background_key
+from loader import assets_loader
+
+
+def surface_bytes(surf):
+    return surf.get_pitch() * surf.get_height()
+
+
+class RegistryEntry:
+    __slots__ = ('surface', 'group', 'bytes', 'refs')
+
+    def __init__(self, surface, group):
+        self.surface = surface
+        self.group = group
+        self.bytes = surface_bytes(surface)
+        self.refs = 0
+
+
+class AssetRegistry:
+    def __init__(self, loader, budget=None):
+        self.loader = loader
+        self.memory_budget = budget  # bytes of surface memory, None for settings.ASSET_MEMORY_BUDGET
+        self.entries = OrderedDict()  # key -> RegistryEntry, least recently used first
+        self.total_bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def budget(self):
+        if self.memory_budget is not None:
+            return self.memory_budget
+        # Looked up on use, so importing the registry pulls in none of the game's
+        # modules (see check_imports.py) and changes to the setting apply
+        from settings import ASSET_MEMORY_BUDGET
+        return ASSET_MEMORY_BUDGET
+
+    def key(self, path, scale=None, alpha=True):
+        return (normpath(path), tuple(scale) if scale else None, alpha)
+
+    def request(self, path, alpha=True):
+        """Start decoding `path` in the background unless it is cached; returns a loader key"""
+        key = self.key(path, None, alpha)
+        if key in self.entries:
+            return ('cached', key)  # never pending, so the loader reports it done
+        return self.loader.request_image(path, alpha)
+
+    def request_background(self, size):
+        key = self.key(background_key(size), None, False)
+        if key in self.entries:
+            return ('cached', key)
+        return self.loader.request_background(size)
+
+    def acquire(self, key, load, group):
+        """Shared surface for `key`, made with load() on a miss; adds a reference"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self.entries[key] = RegistryEntry(load(), group)
+            self.total_bytes += entry.bytes
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        entry.refs += 1
+        self.evict()
+        return entry.surface
+
+    def image(self, path, scale=None, alpha=True, group=None):
+        """
+        Shared surface of the image at `path`, scaled to `scale` if given.
+        Pass the same arguments to release() when done with it.
+        """
+        group = group or basename(dirname(normpath(path))) or 'images'
+        key = self.key(path, scale, alpha)
+        if scale:
+            return self.acquire(key, lambda: self.scaled(path, key[1], alpha, group), group)
+        return self.acquire(key, lambda: self.loader.get(self.loader.request_image(path, alpha)), group)
+
+    def scaled(self, path, size, alpha, group):
+        # The original is only needed while scaling; released it stays cached until evicted
+        original = self.image(path, None, alpha, group)
+        surf = pygame.transform.scale(original, size)
+        self.release(path, None, alpha)
+        return surf
+
+    def frames(self, paths, group=None):
+        return [self.image(path, group=group) for path in paths]
+
+    def background(self, size):
+        """Background cropped and scaled to `size`"""
+        key = self.key(background_key(size), None, False)
+        return self.acquire(key, lambda: self.loader.get(self.loader.request_background(size)), 'screen')
+
+    def release(self, path, scale=None, alpha=True):
+        self.release_key(self.key(path, scale, alpha))
+
+    def release_frames(self, paths):
+        for path in paths:
+            self.release(path)
+
+    def release_background(self, size):
+        self.release_key(self.key(background_key(size), None, False))
+
+    def release_key(self, key):
+        entry = self.entries[key]
+        entry.refs -= 1
+        if entry.refs <= 0:
+            self.evict()
+
+    def evict(self):
+        """Drop unreferenced entries, least recently used first, until under budget"""
+        if self.total_bytes <= self.budget:
+            return
+        for key in [key for key, entry in self.entries.items() if entry.refs <= 0]:
+            entry = self.entries.pop(key)
+            self.total_bytes -= entry.bytes
+            self.evictions += 1
+            if self.total_bytes <= self.budget:
+                break
+
+    def report(self):
+        """{group: bytes of surface memory held}, largest first"""
+        groups = {}
+        for entry in self.entries.values():
+            groups[entry.group] = groups.get(entry.group, 0) + entry.bytes
+        return dict(sorted(groups.items(), key=lambda item: item[1], reverse=True))
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'referenced': sum(1 for entry in self.entries.values() if entry.refs > 0),
+            'bytes': self.total_bytes,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+assets_registry = AssetRegistry(assets_loader)
@@ -0,0 +1,77 @@
+"""
+Dirty-rectangle renderer for the playing state.
+
+Instead of re-blitting the whole background and flipping the full display
+every frame, only the regions that were drawn last frame are restored from
+a cached static layer (background + graves) and only the regions touched
+this frame and last frame are pushed with pygame.display.update(rects).
+"""
+
+import pygame
+
+
+class DirtyRenderer:
+    def __init__(self, screen, enabled=True, max_dirty_ratio=0.5):
+        self.screen = screen
+        self.enabled = enabled
+        # Fall back to a full flip once the dirty area covers this much of the screen
+        self.max_dirty_ratio = max_dirty_ratio
+        self.screen_area = screen.get_width() * screen.get_height()
+
+        self.dirty = []       # regions drawn this frame
+        self.last_dirty = []  # regions drawn last frame, restored at the next begin()
+        self.full_redraw = True
+        self.tracking = False
+
+        # Stats for the last presented frame
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Force the next tracked frame to redraw and present the whole screen"""
+        self.full_redraw = True
+
+    def begin(self, static_layer):
+        """Start a tracked frame by restoring last frame's regions from `static_layer`"""
+        self.tracking = True
+        if self.full_redraw or not self.enabled:
+            self.screen.blit(static_layer, (0, 0))
+        else:
+            for rect in self.last_dirty:
+                self.screen.blit(static_layer, rect, rect)
+
+    def mark(self, rect):
+        """Record a region drawn this frame; accepts None for draws that were skipped"""
+        if rect:
+            self.dirty.append(pygame.Rect(rect))
+
+    def present(self, rects=None):
+        """
+        Push this frame to the display. Untracked frames flip the whole
+        screen unless the caller passes the `rects` it changed.
+        """
+        if not self.tracking:
+            # Untracked frame (menu, pause, game over): whatever is on screen
+            # now is not the static layer, so the next tracked frame starts over
+            if rects is None:
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            self.dirty = []
+            self.last_dirty = []
+            self.full_redraw = True
+            return
+
+        update_rects = self.last_dirty + self.dirty
+        dirty_area = sum(rect.width * rect.height for rect in update_rects)
+        if self.full_redraw or not self.enabled or dirty_area > self.screen_area * self.max_dirty_ratio:
+            pygame.display.flip()
+            self.full_flips += 1
+        else:
+            pygame.display.update(update_rects)
+            self.partial_updates += 1
+
+        self.last_dirty = self.dirty
+        self.dirty = []
+        self.full_redraw = False
+        self.tracking = False
@@ -0,0 +1,135 @@
+"""
+Round recording and deterministic replay.
+
+A round is fully decided by its RNG seed and the clicks applied at each
+simulation step (see simulation.py), so a replay file only stores those
+plus the result the round ended with. With RECORD_REPLAYS turned on in
+settings.py the game records every finished round to REPLAY_DIR. Pausing
+does not change the round, so only clicks are recorded.
+
+Play a replay back and check it reproduces the recorded result:
+    python replay.py replays/<file>.replay            as fast as possible, no window
+    python replay.py replays/<file>.replay --watch    in the game window, in real time
+    python replay.py replays/<file>.replay --watch --speed 4
+
+The headless run exits with status 1 when the result differs, so replays
+double as regression tests; --repeat N times it as a profiling workload.
+The game modules are imported lazily so that the headless run can switch
+to the dummy video and audio drivers first.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+REPLAY_VERSION = 1
+
+
+def round_result(sim):
+    """What a replay has to reproduce: the score, the stats and how many steps the round took"""
+    return {'steps': sim.steps, 'score': sim.score, 'final_score': sim.final_score(), **sim.stats()}
+
+
+class Replay:
+    def __init__(self, seed, timestep, clicks=None, result=None):
+        self.seed = seed
+        self.timestep = timestep
+        self.clicks = clicks if clicks is not None else []  # (step, x, y), in order
+        self.result = result
+
+    def record(self, step, clicks):
+        for x, y in clicks:
+            self.clicks.append((step, x, y))
+
+    def clicks_by_step(self):
+        """{step: [pos, ...]} for feeding GameState.step"""
+        steps = {}
+        for step, x, y in self.clicks:
+            steps.setdefault(step, []).append((x, y))
+        return steps
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, datetime.now().strftime("%Y%m%d_%H%M%S") + f"_{self.seed}.replay")
+        data = {
+            'version': REPLAY_VERSION,
+            'seed': self.seed,
+            'timestep': self.timestep,
+            'clicks': [value for click in self.clicks for value in click],  # flattened (step, x, y)
+            'result': self.result,
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != REPLAY_VERSION:
+            raise ValueError(f"{path}: unsupported replay version {data.get('version')}")
+        flat = data['clicks']
+        clicks = [tuple(flat[i:i + 3]) for i in range(0, len(flat), 3)]
+        return cls(data['seed'], data['timestep'], clicks, data['result'])
+
+
+def play(replay, use_store=False):
+    """Run the round of `replay` headless, as fast as possible; returns the finished GameState"""
+    from simulation import GameState
+    sim = GameState(replay.seed, use_store=use_store)
+    clicks = replay.clicks_by_step()
+    # Stop where the recording ended even if the round does not
+    limit = replay.result['steps'] if replay.result else float('inf')
+    while not sim.over and sim.steps < limit:
+        sim.step(replay.timestep, clicks.get(sim.steps, ()))
+    return sim
+
+
+def differences(expected, actual):
+    """{key: (expected, actual)} for every value of the result that differs"""
+    return {key: (expected.get(key), actual.get(key))
+            for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded round and check its result")
+    parser.add_argument('path')
+    parser.add_argument('--watch', action='store_true', help="play it in the game window instead of headless")
+    parser.add_argument('--speed', type=float, default=1.0, help="game speed when watching")
+    parser.add_argument('--repeat', type=int, default=1, help="headless runs to time")
+    parser.add_argument('--store', action='store_true', help="use the NumPy zombie store")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    if args.watch:
+        import main as game_main
+        game = game_main.Game()
+        game.game_clock.scale = args.speed
+        game.watch(replay)
+        game.run()
+        return
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        sim = play(replay, args.store)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    print(f"{sim.steps} steps ({sim.clock.seconds:.1f} s of game time) in {best * 1000:.1f} ms, "
+          f"{sim.clock.seconds / best:.0f}x real time")
+
+    diff = differences(replay.result or {}, round_result(sim))
+    if diff:
+        for key, (expected, actual) in sorted(diff.items()):
+            print(f"  {key}: recorded {expected}, replayed {actual}")
+        sys.exit("Replay does not match the recording")
+    print(f"Replay matches: final score {sim.final_score()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Event scheduler for timed game mechanics.
+
+Spawns, grave additions, music changes and groans are registered as timers
+on a heap ordered by due time, so a frame only looks at the earliest timer
+instead of polling every mechanic. Time is game time in milliseconds from
+the game clock (game_clock.py), handed to update() after every fixed step,
+so timers stop while the game is paused or over.
+
+A timer fires once (at/after) or repeatedly (every). While a callback runs,
+`now` is that timer's due time, so timers it schedules are relative to when
+it was due rather than to the end of the step and do not drift.
+"""
+
+import heapq
+from itertools import count
+
+
+class Timer:
+    __slots__ = ('time', 'interval', 'callback', 'args', 'cancelled')
+
+    def __init__(self, time, interval, callback, args):
+        self.time = time
+        self.interval = interval  # ms between repeats, None to fire once
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    def __init__(self):
+        self.now = 0  # ms of game time
+        self.queue = []  # (time, order, Timer) heap; cancelled timers are skipped when popped
+        self.order = count()  # keeps timers due at the same time in the order they were added
+
+        # Counters
+        self.fired = 0
+
+    def push(self, timer):
+        heapq.heappush(self.queue, (timer.time, next(self.order), timer))
+        return timer
+
+    def at(self, time, callback, *args):
+        """Call callback(*args) once at game time `time`; returns the Timer"""
+        return self.push(Timer(time, None, callback, args))
+
+    def after(self, delay, callback, *args):
+        return self.at(self.now + delay, callback, *args)
+
+    def every(self, interval, callback, *args, start=None):
+        """Call callback(*args) every `interval` ms, first at `start` (default: one interval from now)"""
+        first = self.now + interval if start is None else start
+        return self.push(Timer(first, interval, callback, args))
+
+    def update(self, now):
+        """Fire every timer due by game time `now`, in order"""
+        queue = self.queue
+        while queue and queue[0][0] <= now:
+            _, _, timer = heapq.heappop(queue)
+            if timer.cancelled:
+                continue
+            self.now = timer.time
+            if timer.interval is not None:
+                timer.time += timer.interval
+                self.push(timer)
+            self.fire(timer)
+            self.fired += 1
+        self.now = now
+
+    def fire(self, timer):
+        # Every callback goes through here, so a profiler can time them all
+        # without wrapping the callbacks the timers hold (see profiler_overlay.py)
+        timer.callback(*timer.args)
+
+    def clear(self):
+        """Drop every timer and restart game time at 0"""
+        self.queue.clear()
+        self.now = 0
+
+    def __len__(self):
+        return sum(1 for _, _, timer in self.queue if not timer.cancelled)
@@ -2,22 +2,50 @@ import pygame
 import random
 import math
 import time
-import audio
 import os
 import json
 from datetime import datetime
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-# pygame.mixer.set_num_channels(32)
-
-audio = audio.audio()
+# Constants only: pygame, the mixer and the sounds are started by the game
+# (see main.Game), so headless tools can import these without opening them
 
 # Constants
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
-FPS = 60
+FPS = 60  # render frame cap, raise it for 120/144 Hz displays
+TICK_RATE = 60  # fixed simulation steps per second
+TIMESTEP = 1 / TICK_RATE
+MAX_FRAME_TIME = 0.25  # clamp long frames so a stall can't cause a catch-up spiral
+TIME_SCALE = 1.0  # game speed: below 1 for slow motion, above 1 to fast-forward (soak testing)
+
+# Keep zombies in NumPy columns with vectorized updates (needs numpy)
+USE_ZOMBIE_STORE = False
+
+# Rendering
+DIRTY_RECT_RENDERING = True  # only redraw changed regions while playing
+MAX_DIRTY_RATIO = 0.5  # fall back to a full flip above this fraction of the screen
+
+# Audio
+STEREO_PANNING = 0.6  # 0 keeps effects centred, 1 pans them hard left/right at the screen edges
+HIT_TONES = False  # procedural blip on every kill, pitched up with the combo (see sfx.py)
+SFX_CACHE_DIR = None  # e.g. os.path.join('assets', 'sfx_cache') to keep generated effects on disk
+
+# Assets
+ASSET_MEMORY_BUDGET = 64 * 2**20  # bytes of cached surfaces before unused ones are evicted
+
+# Set to True to print time to first frame and to game assets ready on startup
+REPORT_STARTUP_TIME = False
+REPORT_ASSET_MEMORY = False  # surface memory per asset group once game assets are loaded
+
+# Replays (see replay.py)
+RECORD_REPLAYS = False  # set to True to save the seed and clicks of every finished round to REPLAY_DIR
+REPLAY_DIR = 'replays'
+
+# Profiler overlay (see profiler_overlay.py)
+PROFILER_KEY = pygame.K_F3  # show/hide frame times, time per phase and entity counts
+TRACE_KEY = pygame.K_F4  # with the overlay up, save a Chrome trace of the last TRACE_SECONDS
+TRACE_SECONDS = 10
+TRACE_DIR = 'traces'
 
 # Colors
 WHITE = (255, 255, 255)
@@ -39,6 +67,9 @@ GOLD = (255, 215, 0)
 INITIAL_HEALTH = 15
 ZOMBIE_SPEED_BASE = 50  # pixels per second
 DIFFICULTY_INCREASE_INTERVAL = 30000  # 30 seconds
+SPAWN_INTERVALS = (3000, 2000, 1000, 750, 500)  # ms between spawns, one step faster every DIFFICULTY_INCREASE_INTERVAL
+GRAVE_ADD_INTERVAL = 30000  # two more graves this often, up to the maximum
 LANES = 5
 LANE_HEIGHT = 100
+ZOMBIE_SIZE = (166, 144)  # zombie hit box, the size of the zombie animation frames
 GROAN_TIME = 2500
\ No newline at end of file
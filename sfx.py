@@ -0,0 +1,129 @@
+"""
+Procedural sound effects (needs NumPy).
+
+Tones, frequency sweeps and noise bursts are synthesized as NumPy arrays
+and turned into Sounds with pygame.sndarray.make_sound, converted to the
+format the mixer was actually opened with (pygame.mixer.get_init()).
+
+Every generated sound is memoized by its parameters and the mixer format,
+so a sound is synthesized once per run; with a cache directory the PCM is
+also kept on disk for the next run. Without NumPy every generator returns
+None and callers skip the sound.
+"""
+
+import hashlib
+import os
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HIT_BASE_FREQ = 440  # Hz of the first hit of a combo
+HIT_PITCH_STEPS = 12  # combo hits rise a semitone each, up to an octave
+
+# dtype of each mixer sample format (negative sizes are signed)
+SAMPLE_TYPES = {8: 'uint8', -8: 'int8', 16: 'uint16', -16: 'int16', -32: 'int32', 32: 'float32'}
+
+
+def to_mixer_samples(wave, mixer_init):
+    """Float samples in [-1, 1] as an array in the mixer's sample format and channel count"""
+    _, size, channels = mixer_init
+    dtype = np.dtype(SAMPLE_TYPES[size])
+    if dtype.kind == 'f':
+        samples = wave.astype(dtype)
+    else:
+        # Unsigned formats are centred on half their range
+        info = np.iinfo(dtype)
+        middle = (int(info.max) + int(info.min) + 1) // 2
+        samples = (wave * (int(info.max) - middle) + middle).astype(dtype)
+    if channels == 1:
+        return samples
+    return np.ascontiguousarray(np.repeat(samples[:, None], channels, axis=1))
+
+
+class SfxSynth:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir  # keep generated PCM on disk too when set
+        self.sounds = {}  # key -> Sound
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def sound(self, key, make_wave):
+        """Memoized Sound for `key`; make_wave(freq) returns float samples at the mixer rate"""
+        if np is None:
+            return None
+        mixer_init = pygame.mixer.get_init()
+        key = key + (mixer_init,)
+        sound = self.sounds.get(key)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        cache_path = None
+        if self.cache_dir:
+            cache_path = os.path.join(self.cache_dir, hashlib.sha1(repr(key).encode()).hexdigest() + '.pcm')
+            if os.path.exists(cache_path):
+                with open(cache_path, 'rb') as f:
+                    sound = pygame.mixer.Sound(buffer=f.read())
+                self.disk_hits += 1
+
+        if sound is None:
+            wave = np.clip(make_wave(mixer_init[0]), -1.0, 1.0)
+            sound = pygame.sndarray.make_sound(to_mixer_samples(wave, mixer_init))
+            if cache_path:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(cache_path, 'wb') as f:
+                    f.write(sound.get_raw())
+
+        self.sounds[key] = sound
+        return sound
+
+    @staticmethod
+    def envelope(count, freq, attack, decay):
+        """Linear attack, then exponential decay with time constant `decay` seconds"""
+        t = np.arange(count) / freq
+        env = np.exp(-np.maximum(t - attack, 0) / decay)
+        if attack > 0:
+            env *= np.minimum(t / attack, 1.0)
+        return env
+
+    def tone(self, pitch, duration, volume=0.5, attack=0.005, decay=0.05):
+        def make_wave(freq):
+            count = int(duration * freq)
+            t = np.arange(count) / freq
+            return volume * np.sin(2 * np.pi * pitch * t) * self.envelope(count, freq, attack, decay)
+        return self.sound(('tone', pitch, duration, volume, attack, decay), make_wave)
+
+    def sweep(self, start_pitch, end_pitch, duration, volume=0.5, attack=0.005, decay=0.1):
+        """Tone gliding exponentially from start_pitch to end_pitch"""
+        def make_wave(freq):
+            count = int(duration * freq)
+            pitch = start_pitch * (end_pitch / start_pitch) ** (np.arange(count) / max(count - 1, 1))
+            phase = 2 * np.pi * np.cumsum(pitch) / freq
+            return volume * np.sin(phase) * self.envelope(count, freq, attack, decay)
+        return self.sound(('sweep', start_pitch, end_pitch, duration, volume, attack, decay), make_wave)
+
+    def noise(self, duration, volume=0.5, decay=0.05, seed=0):
+        """White noise burst; the seed keeps it identical between runs"""
+        def make_wave(freq):
+            count = int(duration * freq)
+            rng = np.random.default_rng(seed)
+            return volume * rng.uniform(-1.0, 1.0, count) * self.envelope(count, freq, 0.0, decay)
+        return self.sound(('noise', duration, volume, decay, seed), make_wave)
+
+    def hit(self, combo):
+        """Short hit blip, a semitone higher for every combo step up to an octave"""
+        step = min(max(combo, 0), HIT_PITCH_STEPS)
+        return self.tone(HIT_BASE_FREQ * 2 ** (step / 12), 0.1, volume=0.4, decay=0.03)
+
+    def warm(self):
+        """Generate every hit pitch ahead of time so none is synthesized mid-game"""
+        for combo in range(HIT_PITCH_STEPS + 1):
+            self.hit(combo)
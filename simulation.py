@@ -0,0 +1,311 @@
+"""
+Headless simulation core.
+
+GameState holds everything that decides how a round plays out: zombies,
+graves, health, score and combo, the game clock and the event scheduler.
+It never touches a surface, the display or the mixer, so rounds can run
+without a window as fast as the CPU allows (pygame is still imported for
+Rect; run with SDL_VIDEODRIVER=dummy and SDL_AUDIODRIVER=dummy when there
+is no display or sound card).
+
+step(dt, inputs) applies the clicks in `inputs`, advances the round by
+`dt` seconds and returns what happened as events, which main.Game turns
+into sounds, effects and popups:
+
+    ('spawn', zombie)                               a zombie rose from a grave
+    ('bomb', zombie)                                a click hit a zombie, it dies KILL_DELAY ms later
+    ('miss', pos)                                   a click hit nothing
+    ('kill', zombie, points, category, color, combo)
+    ('eat', zombie)                                 a zombie reached the house
+    ('graves',)                                     graves were added
+    ('music', phase)                                the music moves on to phase 1 or 2
+    ('groan',)
+    ('game_over',)
+
+All randomness comes from the state's own random.Random, so a round is
+reproduced exactly by its seed, step sizes and inputs (see replay.py).
+
+The difficulty knobs in TUNING default to the settings and can be
+overridden per GameState, e.g. GameState(tuning={'max_graves': 24}), for
+tuning them with batch.py.
+"""
+
+import random
+
+from settings import *
+from zombie import Zombie
+from spatial_index import LaneIndex
+from pool import ObjectPool
+from entity_manager import EntityList
+from scheduler import Scheduler
+from game_clock import GameClock
+try:
+    from zombie_store import ZombieStore
+except ImportError:  # NumPy not installed
+    ZombieStore = None
+
+HOUSE_X = int(SCREEN_WIDTH * 0.2)  # zombies past this have reached the house
+# Click to kill: the cherry bomb animation (7 frames at 30 fps), then the 100 ms boom
+KILL_DELAY = 7 / 30 * 1000 + 100
+# Difficulty knobs a GameState can override through its `tuning` dict
+TUNING = ('spawn_intervals', 'difficulty_interval', 'grave_add_interval',
+          'grave_spawn_delay', 'grave_count', 'max_graves')
+
+
+class GameState:
+    def __init__(self, seed=None, use_store=False, time_scale=1.0, tuning=None):
+        self.tuning = dict(tuning or {})
+        unknown = self.tuning.keys() - set(TUNING)
+        if unknown:
+            raise ValueError(f"Unknown tuning knobs: {', '.join(sorted(unknown))}")
+        self.use_store = use_store and ZombieStore is not None
+        self.zombie_pool = ObjectPool(Zombie)
+        self.zombie_list = EntityList()
+        self.departed = []  # targeted zombies that reached the house before their cherry bomb went off
+        self.zombie_store = None
+        self.clock = GameClock(time_scale)
+        self.scheduler = Scheduler()
+        self.rng = random.Random()
+        self.events = []
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start a new round; the same seed and inputs replay the same round"""
+        self.release_zombies()
+        self.seed = seed
+        self.rng.seed(seed)
+        self.health = INITIAL_HEALTH
+        self.score = 0
+        self.hits = 0
+        self.misses = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.clock.reset()
+        self.steps = 0
+        self.end_time = None  # game time of the end of the round
+        self.spawn_intervals = SPAWN_INTERVALS
+        self.difficulty_interval = DIFFICULTY_INCREASE_INTERVAL
+        self.grave_add_interval = GRAVE_ADD_INTERVAL
+        self.grave_spawn_delay = 200  # ms
+        self.grave_count = 6
+        self.max_graves = 18
+        for name, value in self.tuning.items():
+            setattr(self, name, value)
+        # Zombies speed up by one base speed every DIFFICULTY_INCREASE_INTERVAL;
+        # scaling the time they see moves that ramp with a tuned interval
+        self.difficulty_scale = DIFFICULTY_INCREASE_INTERVAL / self.difficulty_interval
+        self.last_zombie_spawn = 0
+        self.zombie_spawn_interval = self.spawn_intervals[0]
+        # Array-backed store when enabled, otherwise a plain list of Zombie objects
+        self.zombie_store = ZombieStore() if self.use_store else None
+        self.zombie_list.clear()
+        self.zombies = self.zombie_store if self.zombie_store is not None else self.zombie_list
+        self.zombie_index = LaneIndex(ZOMBIE_SIZE)  # clickable zombies only
+        self.graves = []  # List of graves: each is a dict with x, y, lane, last_spawn
+        self.events = []
+        self.init_graves()
+        self.schedule_events()
+
+    def release_zombies(self):
+        if self.zombie_store is None:
+            for zombie in self.zombie_list:
+                self.zombie_pool.release(zombie)
+            for zombie in self.departed:
+                self.zombie_pool.release(zombie)
+        self.departed = []
+
+    def release_departed(self):
+        """Release the departed zombies whose cherry bomb has gone off (and been presented)"""
+        waiting = []
+        for zombie in self.departed:
+            if zombie.hit:
+                self.zombie_pool.release(zombie)
+            else:
+                waiting.append(zombie)
+        self.departed = waiting
+
+    @property
+    def over(self):
+        return self.end_time is not None
+
+    def schedule_events(self):
+        """Register the round's timed mechanics"""
+        self.scheduler.clear()
+        self.scheduler.at(0, self.spawn_zombie)
+        # Spawns speed up every difficulty interval
+        for level, interval in enumerate(self.spawn_intervals[1:], 1):
+            self.scheduler.at(level * self.difficulty_interval, self.set_spawn_interval, interval)
+        self.scheduler.every(self.grave_add_interval, self.add_graves, 2)
+        self.scheduler.at(2 * self.difficulty_interval, self.events.append, ('music', 1))
+        self.scheduler.at(4 * self.difficulty_interval, self.events.append, ('music', 2))
+        self.scheduler.every(GROAN_TIME, self.events.append, ('groan',), start=0)
+
+    def set_spawn_interval(self, interval):
+        self.zombie_spawn_interval = interval
+
+    def init_graves(self):
+        used_positions = set()
+        for i in range(self.grave_count):
+            while True:
+                lane = self.rng.randint(0, LANES - 1)
+                x = self.rng.randint(int(SCREEN_WIDTH * 0.7), SCREEN_WIDTH - 80)
+                pos = (lane, x)
+                if pos not in used_positions:
+                    used_positions.add(pos)
+                    break
+            y = 150 + lane * LANE_HEIGHT + 25
+            self.graves.append({'lane': lane, 'x': x, 'y': y, 'last_spawn': None, 'img_idx': i})
+
+    def add_graves(self, n=2):
+        min_distance = 80  # Khoảng cách tối thiểu giữa các mộ cùng lane
+        added = 0
+        tries = 0
+        while added < n and len(self.graves) < self.max_graves and tries < 200:
+            lane = self.rng.randint(0, LANES - 1)
+            x = self.rng.randint(int(SCREEN_WIDTH * 0.7), SCREEN_WIDTH - 80)
+            # Kiểm tra khoảng cách với các mộ cũ cùng lane
+            too_close = False
+            for g in self.graves:
+                if g['lane'] == lane and abs(g['x'] - x) < min_distance:
+                    too_close = True
+                    break
+            if not too_close:
+                y = 150 + lane * LANE_HEIGHT + 25
+                self.graves.append({'lane': lane, 'x': x, 'y': y, 'last_spawn': None, 'img_idx': len(self.graves)})
+                added += 1
+            tries += 1
+        if added:
+            self.events.append(('graves',))
+
+    def spawn_zombie(self):
+        """Spawn timer: raise a zombie from a random grave and schedule the next spawn"""
+        now = self.scheduler.now
+        grave = self.rng.choice(self.graves)
+        if grave['last_spawn'] is not None and now - grave['last_spawn'] < self.grave_spawn_delay:
+            # This grave spawned just now, try again once it is free
+            self.scheduler.after(grave['last_spawn'] + self.grave_spawn_delay - now, self.spawn_zombie)
+            return
+
+        zombie = self.add_zombie(grave['lane'], grave['x'], now)
+        self.last_zombie_spawn = now
+        grave['last_spawn'] = now
+        self.scheduler.after(self.zombie_spawn_interval, self.spawn_zombie)
+        self.events.append(('spawn', zombie))
+
+    def add_zombie(self, lane, spawn_x, now):
+        """Put a zombie in the round at game time `now`"""
+        if self.zombie_store is not None:
+            zombie = self.zombie_store.spawn(lane, spawn_x, now)
+        else:
+            zombie = self.zombie_pool.acquire(lane, spawn_x, ZOMBIE_SIZE, now)
+            self.zombie_list.add(zombie)
+        self.zombie_index.add(zombie)
+        return zombie
+
+    def click(self, pos):
+        zombie = self.zombie_index.hit_test(pos)
+        if zombie:
+            zombie.target = True
+            self.zombie_index.discard(zombie)
+            self.scheduler.after(KILL_DELAY, self.kill, zombie)
+            self.events.append(('bomb', zombie))
+        else:
+            self.misses += 1
+            self.combo = 0
+            self.events.append(('miss', pos))
+
+    def kill(self, zombie):
+        """The cherry bomb thrown at `zombie` went off"""
+        if zombie.hit:
+            return
+        score, category, category_color = zombie.take_hit(self.clock.now)
+
+        combo_bonus = int(score * (self.combo * 0.1))
+        points = score + combo_bonus
+
+        self.score += points
+        self.hits += 1
+        self.combo += 1
+        self.max_combo = max(self.max_combo, self.combo)
+        self.events.append(('kill', zombie, points, category, category_color, self.combo))
+
+    def update_zombies(self, dt):
+        game_duration = self.clock.now * self.difficulty_scale
+        if self.zombie_store is not None:
+            # Movement, house check and removal are vectorized in the store
+            for zombie in self.zombie_store.update(game_duration, dt):
+                self.zombie_reached_house(zombie)
+            return
+
+        self.zombie_list.update(self.step_zombie, game_duration, dt)
+
+    def step_zombie(self, zombie, game_duration, dt):
+        zombie.update(game_duration, dt)
+        # Thua khi zombie đi được 80% màn hình (không cần tới sát mép)
+        if zombie.rect.right < HOUSE_X and not zombie.hit:
+            self.zombie_reached_house(zombie)
+            # A targeted zombie is still waiting for its cherry bomb; it is
+            # released after the step in which the bomb goes off
+            if zombie.target:
+                self.departed.append(zombie)
+            else:
+                self.zombie_pool.release(zombie)
+            return False
+        elif zombie.hit and zombie.hit_effect_time <= 0:
+            self.zombie_pool.release(zombie)
+            return False
+        return True
+
+    def zombie_reached_house(self, zombie):
+        self.health -= 1
+        self.misses += 1  # Tính là miss khi zombie vào nhà
+        self.zombie_index.discard(zombie)
+        self.combo = 0
+        self.events.append(('eat', zombie))
+
+    def step(self, dt, inputs=()):
+        """
+        Apply the clicks in `inputs` (screen positions), then advance the
+        round by `dt` seconds. Returns the events of this step.
+        """
+        self.events.clear()
+        if self.over:
+            return self.events
+        if self.departed:
+            self.release_departed()
+        for pos in inputs:
+            self.click(pos)
+        self.steps += 1
+        self.clock.step(dt)
+        # Spawns, new graves, music changes, groans and kills that came due
+        self.scheduler.update(self.clock.now)
+        self.update_zombies(dt)
+        if self.health <= 0:
+            self.end_time = self.clock.now
+            self.events.append(('game_over',))
+        return self.events
+
+    def final_score(self):
+        total_shots = self.hits + self.misses
+        accuracy = (self.hits / total_shots) if total_shots > 0 else 0
+
+        end_time = self.end_time if self.end_time is not None else self.clock.now
+        game_duration = end_time / 1000
+
+        time_bonus = int(game_duration * 10)
+        accuracy_bonus = int(self.score * accuracy)
+        combo_bonus = self.max_combo * 50
+
+        return self.score + time_bonus + accuracy_bonus + combo_bonus
+
+    def stats(self):
+        """Round stats as saved with the score"""
+        total_shots = self.hits + self.misses
+        end_time = self.end_time if self.end_time is not None else self.clock.now
+        return {
+            'accuracy': (self.hits / total_shots * 100) if total_shots > 0 else 0,
+            'max_combo': self.max_combo,
+            'hits': self.hits,
+            'misses': self.misses,
+            'time': end_time / 1000
+        }
@@ -0,0 +1,81 @@
+"""
+Lane-bucketed spatial index for zombie hit-testing.
+
+Clickable zombies are kept in one bucket per lane, sorted by rect.left
+(read through zombie.left, which the array store keeps as a column). A
+click only looks at the lanes whose zombie rects can cover the cursor
+and, inside those, only at the zombies whose x range can contain it.
+"""
+
+from itertools import count
+
+from settings import *
+
+
+def lane_center_y(lane):
+    return 150 + lane * LANE_HEIGHT + 25
+
+
+class LaneIndex:
+    def __init__(self, zombie_size, lanes=LANES):
+        # All zombies share the same frame size, so a bucket sorted by
+        # rect.left is also sorted by rect.right
+        self.width, self.height = zombie_size
+        self.buckets = [[] for _ in range(lanes)]
+        self.order = count()
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def clear(self):
+        for bucket in self.buckets:
+            bucket.clear()
+
+    def lower_bound(self, bucket, left):
+        """Index of the first zombie in `bucket` whose rect.left >= left"""
+        lo, hi = 0, len(bucket)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bucket[mid].left < left:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def add(self, zombie):
+        # Spawn order breaks ties the same way the old list scan did
+        zombie.index_order = next(self.order)
+        bucket = self.buckets[zombie.lane]
+        bucket.insert(self.lower_bound(bucket, zombie.left), zombie)
+
+    def discard(self, zombie):
+        bucket = self.buckets[zombie.lane]
+        for i in range(self.lower_bound(bucket, zombie.left), len(bucket)):
+            if bucket[i] is zombie:
+                del bucket[i]
+                return
+        # Fall back to a full lane scan if the rect moved since it was indexed
+        if zombie in bucket:
+            bucket.remove(zombie)
+
+    def lanes_at(self, y):
+        # Same rounding as Rect.centery, so this matches collidepoint exactly
+        half = self.height // 2
+        return [lane for lane in range(len(self.buckets))
+                if lane_center_y(lane) - half <= y < lane_center_y(lane) - half + self.height]
+
+    def hit_test(self, pos):
+        """Return the earliest-spawned clickable zombie under `pos`, or None"""
+        x, y = pos
+        best = None
+        for lane in self.lanes_at(y):
+            bucket = self.buckets[lane]
+            # Zombies that can contain x have left in (x - width, x]
+            for i in range(self.lower_bound(bucket, x - self.width + 1), len(bucket)):
+                zombie = bucket[i]
+                if zombie.left > x:
+                    break
+                if zombie.is_clickable() and zombie.get_hit_rect().collidepoint(pos):
+                    if best is None or zombie.index_order < best.index_order:
+                        best = zombie
+        return best
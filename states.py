@@ -0,0 +1,305 @@
+"""
+Game states.
+
+Each screen is a State, and Game.change_state() switches between them. The
+main loop calls, every frame, handle_event() for each event, update() with
+the frame time and draw(), which returns the rects it changed for the
+renderer (None for the whole screen). Transitions call exit() on the old
+state and enter() on the new one with the name of the other state.
+
+One-off work belongs in the transition hooks: music changes, saving the
+score and building overlays happen once in enter(). The pause and game
+over screens are composited once on entry, so while they stay up a frame
+costs one blit of the cached composite.
+"""
+
+from settings import *
+
+from loader import assets_loader
+
+
+class State:
+    name = None
+
+    def __init__(self, game):
+        self.game = game
+
+    def enter(self, previous):
+        pass
+
+    def exit(self, next):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self, frame_time):
+        pass
+
+    def draw(self):
+        return None
+
+
+class OverlayState(State):
+    """Frozen game scene under a dimmed overlay, built once on entry"""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.shade = None  # dimming layer, shared by every composite
+        self.composite = None
+        self.buttons = {}
+        self.shown = False
+
+    def enter(self, previous):
+        game = self.game
+        if self.shade is None:
+            self.shade = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.shade.set_alpha(180)
+            self.shade.fill(BLACK)
+        self.draw_scene()
+        game.screen.blit(self.shade, (0, 0))
+        self.buttons = self.draw_overlay()
+        self.composite = game.screen.copy()
+        self.shown = False
+
+    def exit(self, next):
+        self.composite = None
+
+    def draw_scene(self):
+        pass
+
+    def draw_overlay(self):
+        """Draw the overlay on the screen and return its buttons {action: rect}"""
+        return {}
+
+    def draw_title(self, text, color, y):
+        game = self.game
+        shadow = game.font_large.render(text, True, BLACK)
+        main_text = game.font_large.render(text, True, color)
+        game.screen.blit(shadow, shadow.get_rect(center=(SCREEN_WIDTH // 2 + 3, y + 3)))
+        game.screen.blit(main_text, main_text.get_rect(center=(SCREEN_WIDTH // 2, y)))
+
+    def draw_button(self, text, color, rect):
+        game = self.game
+        pygame.draw.rect(game.screen, color, rect, border_radius=12)
+        pygame.draw.rect(game.screen, WHITE, rect, 3, border_radius=12)
+        label = game.font_medium.render(text, True, WHITE)
+        game.screen.blit(label, label.get_rect(center=rect.center))
+
+    def clicked(self, event):
+        """Action of the overlay button under a left click, or None"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for action, rect in self.buttons.items():
+                if rect.collidepoint(event.pos):
+                    return action
+        return None
+
+    def draw(self):
+        # The composite stays on screen; only the first frame has to push it
+        self.game.screen.blit(self.composite, (0, 0))
+        if self.shown:
+            return []
+        self.shown = True
+        return None
+
+
+class MenuState(State):
+    name = "menu"
+
+    def enter(self, previous):
+        if previous in (None, "paused", "game_over"):
+            self.game.audio.play_background()
+        if previous in ("paused", "game_over"):
+            # The round is over: its surfaces may be evicted while in the menus
+            self.game.unload_assets()
+        self.game.menu.invalidate()
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for button in game.menu.get_buttons():
+                if button["rect"].collidepoint(event.pos):
+                    if button["action"] == "play":
+                        game.start_game()
+                    elif button["action"] == "scores":
+                        game.change_state("scores")
+                    elif button["action"] == "quit":
+                        game.running = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            game.running = False
+
+    def draw(self):
+        return self.game.menu.draw_main_menu()
+
+
+class ScoresState(State):
+    name = "scores"
+
+    def enter(self, previous):
+        # The table only changes when a score is saved, so it is drawn once
+        self.back_rect = self.game.menu.draw_scores_menu(self.game.score_manager)
+        self.shown = False
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.back_rect.collidepoint(event.pos):
+                game.change_state("menu")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            game.running = False
+
+    def draw(self):
+        if self.shown:
+            return []
+        self.shown = True
+        return None
+
+
+class LoadingState(State):
+    name = "loading"
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            self.game.change_state("menu")
+
+    def update(self, frame_time):
+        if assets_loader.ready(self.game.game_asset_keys):
+            self.game.start_game()
+
+    def draw(self):
+        self.game.draw_loading_screen(assets_loader.progress(self.game.game_asset_keys))
+
+
+class PlayingState(State):
+    """Runs the round in fixed TIMESTEP steps, so game speed does not depend on frame rate"""
+    name = "playing"
+
+    def __init__(self, game):
+        super().__init__(game)
+        self.accumulator = 0.0
+
+    def enter(self, previous):
+        game = self.game
+        if previous != "paused":
+            # A new round
+            if previous in ("menu", "loading"):
+                game.audio.play_awooga_sound()
+            game.audio.play_grasswalk()
+            game.reset_game()
+        self.accumulator = 0.0
+        game.game_clock.paused = False
+
+    def exit(self, next):
+        self.game.game_clock.paused = True
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            game.handle_click(event.pos)
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            game.change_state("paused")
+
+    def update(self, frame_time):
+        game = self.game
+        self.accumulator += game.game_clock.frame(frame_time)
+        while self.accumulator >= TIMESTEP and game.state == self.name:
+            self.accumulator -= TIMESTEP
+            game.step(TIMESTEP)
+
+    def draw(self):
+        # Fraction of a step left over, used to interpolate positions
+        self.game.draw_playing(self.accumulator / TIMESTEP)
+        return None
+
+
+class PausedState(OverlayState):
+    name = "paused"
+
+    def handle_event(self, event):
+        game = self.game
+        action = self.clicked(event)
+        if action == "resume":
+            game.change_state("playing")
+        elif action == "menu":
+            game.change_state("menu")
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            game.change_state("playing")
+
+    def draw_scene(self):
+        self.game.draw_game_scene()
+
+    def draw_overlay(self):
+        self.draw_title("PAUSED", GOLD, SCREEN_HEIGHT // 2 - 120)
+
+        button_w, button_h = 220, 60
+        gap = 30
+        center_x = SCREEN_WIDTH // 2
+        center_y = SCREEN_HEIGHT // 2
+        resume_rect = pygame.Rect(center_x - button_w // 2, center_y - button_h - gap // 2, button_w, button_h)
+        menu_rect = pygame.Rect(center_x - button_w // 2, center_y + gap // 2, button_w, button_h)
+        self.draw_button("Resume", (60, 180, 60), resume_rect)
+        self.draw_button("Main Menu", (180, 60, 60), menu_rect)
+        return {'resume': resume_rect, 'menu': menu_rect}
+
+
+class GameOverState(OverlayState):
+    name = "game_over"
+
+    def enter(self, previous):
+        game = self.game
+        game.audio.play_losemusic_sound()
+        game.audio.play_scream_sound()
+
+        # Final score and stats, saved once per round
+        self.final_score = game.sim.final_score()
+        self.stats = game.sim.stats()
+        if game.replay is None:
+            game.score_manager.save_score(self.final_score, self.stats)
+        super().enter(previous)
+
+    def handle_event(self, event):
+        game = self.game
+        action = self.clicked(event)
+        if event.type == pygame.KEYDOWN:
+            action = {pygame.K_r: 'retry', pygame.K_m: 'menu'}.get(event.key)
+        if action == "retry":
+            game.change_state("playing")
+        elif action == "menu":
+            game.change_state("menu")
+
+    def draw_scene(self):
+        game = self.game
+        game.draw_game_background()
+        for zombie in game.sim.zombies:
+            zombie.draw(game.screen, game.zombie_frames)
+
+    def draw_overlay(self):
+        game = self.game
+        self.draw_title("GAME OVER", RED, SCREEN_HEIGHT // 2 - 150)
+
+        score_surface = game.font_medium.render(f"Final Score: {self.final_score}", True, GOLD)
+        game.screen.blit(score_surface, score_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80)))
+        lines = [
+            f"Zombies Defeated: {self.stats['hits']}",
+            f"Shots Missed: {self.stats['misses']}",
+            f"Accuracy: {self.stats['accuracy']:.1f}%",
+            f"Max Combo: {self.stats['max_combo']}",
+            f"Time Survived: {self.stats['time']:.1f}s"
+        ]
+        for i, line in enumerate(lines):
+            stat_surface = game.font_small.render(line, True, WHITE)
+            game.screen.blit(stat_surface, stat_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 20 + i * 25)))
+
+        # Retry and Main Menu buttons, 60px above the bottom of the screen
+        button_w, button_h = 220, 60
+        gap = 30
+        bottom_margin = 60
+        center_x = SCREEN_WIDTH // 2
+        menu_rect = pygame.Rect(center_x - button_w // 2, SCREEN_HEIGHT - bottom_margin - button_h, button_w, button_h)
+        retry_rect = pygame.Rect(center_x - button_w // 2, menu_rect.top - gap - button_h, button_w, button_h)
+        self.draw_button("Retry", (60, 180, 60), retry_rect)
+        self.draw_button("Main Menu", (180, 60, 60), menu_rect)
+        return {'retry': retry_rect, 'menu': menu_rect}
+
+
+STATES = (MenuState, ScoresState, LoadingState, PlayingState, PausedState, GameOverState)
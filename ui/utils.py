@@ -1,14 +1,24 @@
 from settings import *
 from os import walk
 from os.path import join
+from collections import OrderedDict
+from loader import assets_loader
+from registry import assets_registry
 
-def import_image(*path, format = 'png', alpha = True):
+def load_image(full_path, alpha = True, scale = None):
+    """Shared image converted to the display format, optionally scaled (see registry.py)"""
+    return assets_registry.image(full_path, scale, alpha)
+
+def load_sound(full_path):
+    return assets_loader.sound(full_path)
+
+def import_image(*path, format = 'png', alpha = True, scale = None):
     full_path = join(*path) + f'.{format}'
-    surf = pygame.image.load(full_path).convert_alpha() if alpha else pygame.image.load(full_path).convert()
-    return surf
+    return load_image(full_path, alpha, scale)
 
-def import_folder(*path):
-    frames = []
+def folder_frame_paths(*path):
+    """File paths of an animation folder, ordered by their frame number"""
+    paths = []
     for folder_path, _, file_names in walk(join(*path)):
         def extract_number(name):
             try:
@@ -16,15 +26,57 @@ def import_folder(*path):
             except Exception:
                 return float('inf')  # Đưa file không hợp lệ xuống cuối
         for file_name in sorted(file_names, key=extract_number):
-            full_path = join(folder_path, file_name)
-            surf = pygame.image.load(full_path).convert_alpha()
-            frames.append(surf)
-    return frames
+            paths.append(join(folder_path, file_name))
+    return paths
 
-def audio_importer(*path):
-    audio_dict = {}
+def import_folder(*path):
+    return assets_registry.frames(folder_frame_paths(*path))
+
+def release_image(*path, format = 'png', alpha = True, scale = None):
+    """Give back an image taken with import_image (same arguments)"""
+    assets_registry.release(join(*path) + f'.{format}', scale, alpha)
+
+def release_folder(*path):
+    assets_registry.release_frames(folder_frame_paths(*path))
+
+def audio_paths(*path):
+    """{sound name: file path} for every file in an audio folder"""
+    paths = {}
     for folder_path, _, file_names in walk(join(*path)):
         for file_name in file_names:
-            full_path = join(folder_path, file_name)
-            audio_dict[file_name.split('.')[0]] = pygame.mixer.Sound(full_path)
-    return audio_dict
+            paths[file_name.split('.')[0]] = join(folder_path, file_name)
+    return paths
+
+def audio_importer(*path):
+    return {name: load_sound(full_path) for name, full_path in audio_paths(*path).items()}
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color, antialias)"""
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, str(text), color, antialias)
@@ -0,0 +1,130 @@
+"""
+Voice manager for sound effects.
+
+The mixer has a fixed number of channels. Every effect is played through
+VoiceManager.play() with a category, and each category has a voice limit
+and a priority:
+
+- when a category is at its limit the new sound replaces that category's
+  quietest, then oldest, voice, or is dropped if the category does not steal
+- when every channel is busy the least important voice (lowest priority,
+  then quietest, then oldest) is stolen, but only if it ranks below the
+  new sound; otherwise the new sound is dropped
+- the same Sound triggered more than once in a frame plays once
+
+Music is streamed through pygame.mixer.music and does not use these channels.
+"""
+
+import pygame
+
+VOICE_CHANNELS = 32
+
+
+class VoiceCategory:
+    def __init__(self, limit, priority, steal=True):
+        self.limit = limit        # voices of this category playing at once
+        self.priority = priority  # higher steals from lower when the mixer is full
+        self.steal = steal        # at the limit: replace a voice of this category, or drop the new one
+
+
+CATEGORIES = {
+    'alert': VoiceCategory(4, 4),                 # eat, scream, lose: must be heard
+    'ui': VoiceCategory(2, 3),                    # start, awooga
+    'hit': VoiceCategory(6, 2),                   # bonk, cherry bomb
+    'spawn': VoiceCategory(4, 1),                 # digging
+    'ambient': VoiceCategory(2, 0, steal=False),  # groans
+}
+
+
+class Voice:
+    __slots__ = ('sound', 'category', 'priority', 'volume', 'start')
+
+    def __init__(self, sound, category, priority, volume, start):
+        self.sound = sound
+        self.category = category
+        self.priority = priority
+        self.volume = volume
+        self.start = start
+
+    def rank(self):
+        """Sort key of the voice to steal first: least important, quietest, oldest"""
+        return (self.priority, self.volume, self.start)
+
+
+class VoiceManager:
+    def __init__(self, channels=VOICE_CHANNELS, categories=CATEGORIES):
+        pygame.mixer.set_num_channels(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voices = [None] * channels  # Voice on each channel, None when free
+        self.categories = categories
+        self.triggered = set()  # sounds started this frame
+        self.started = 0  # voices started so far, orders voices by age
+
+        # Counters
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.deduplicated = 0
+
+    def begin_frame(self):
+        self.triggered.clear()
+
+    def refresh(self):
+        """Free the channels whose sound has finished"""
+        for i, voice in enumerate(self.voices):
+            if voice and not self.channels[i].get_busy():
+                self.voices[i] = None
+
+    def pick_channel(self, settings, category):
+        """Index of the channel for a new `category` voice, or None to drop it"""
+        in_category = [i for i, voice in enumerate(self.voices) if voice and voice.category == category]
+        if len(in_category) >= settings.limit:
+            if not settings.steal:
+                return None
+            self.stolen += 1
+            return min(in_category, key=lambda i: self.voices[i].rank())
+
+        if None in self.voices:
+            return self.voices.index(None)
+
+        lower = [i for i, voice in enumerate(self.voices) if voice.priority < settings.priority]
+        if not lower:
+            return None
+        self.stolen += 1
+        return min(lower, key=lambda i: self.voices[i].rank())
+
+    def play(self, sound, category, volume=1, pan=0.0, loop=0, duration=0, fade_in=0):
+        """
+        Play `sound` as a `category` voice, panned from -1 (left) to 1 (right).
+        Returns the Channel, or None if the sound was dropped or de-duplicated.
+        """
+        if sound in self.triggered:
+            self.deduplicated += 1
+            return None
+        settings = self.categories[category]
+
+        self.refresh()
+        index = self.pick_channel(settings, category)
+        if index is None:
+            self.dropped += 1
+            return None
+
+        channel = self.channels[index]
+        channel.play(sound, loop, duration, fade_in)
+        # Constant level in the centre, fading the far side out towards the edges
+        channel.set_volume(volume * min(1.0, 1.0 - pan), volume * min(1.0, 1.0 + pan))
+        self.voices[index] = Voice(sound, category, settings.priority, volume, self.started)
+        self.started += 1
+        self.triggered.add(sound)
+        self.played += 1
+        return channel
+
+    def stats(self):
+        self.refresh()
+        return {
+            'active': sum(1 for voice in self.voices if voice),
+            'played': self.played,
+            'dropped': self.dropped,
+            'stolen': self.stolen,
+            'deduplicated': self.deduplicated,
+        }
@@ -1,9 +1,40 @@
 from settings import *
 
+def score_for_time_alive(time_alive):
+    """Return (score, category, color) for a zombie hit `time_alive` seconds after spawning"""
+    # Determine score and category based on timing
+    if time_alive <= 0.5:
+        score = 100
+        category = "PERFECT"
+        color = GOLD
+    elif time_alive <= 1.5:
+        score = 75
+        category = "GREAT"
+        color = GREEN
+    elif time_alive <= 3.0:
+        score = 60
+        category = "GOOD"
+        color = BLUE
+    else:
+        score = 50
+        category = "NOT BAD"
+        color = WHITE
+        
+    return score, category, color
+
 class Zombie:
-    def __init__(self, lane, spawn_x=None, frames=[]):
+    # Slotted and resettable so zombies can be recycled through an ObjectPool.
+    # Zombies hold no surfaces: the animation frames are passed to draw()
+    __slots__ = ('lane', 'spawn_time', 'speed', 'speed_multiplier', 'hit', 'target', 'size', 'health',
+                 'animation_frame', 'hit_effect_time', 'frame_index', 'animation_speed',
+                 'rect', 'x', 'prev_x', 'index_order')
+
+    def __init__(self, *args):
+        self.reset(*args)
+
+    def reset(self, lane, spawn_x=None, frame_size=ZOMBIE_SIZE, spawn_time=0):
         self.lane = lane
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = spawn_time  # game time (ms)
         self.speed = ZOMBIE_SPEED_BASE
         self.hit = False
         self.target = False
@@ -13,9 +44,8 @@ class Zombie:
         self.hit_effect_time = 0
 
         # ui
-        self.frames, self.frame_index, self.animation_speed = frames, 0, 0
-        self.image = self.frames[self.frame_index] 
-        self.rect = self.image.get_rect()
+        self.frame_index, self.animation_speed = 0, 0
+        self.rect = pygame.Rect((0, 0), frame_size)
 
         # Spawn zombie at a random position in the right half (50%-100% of screen width)
         if spawn_x is None:
@@ -23,20 +53,27 @@ class Zombie:
         else:
             self.rect.centerx = spawn_x
         self.rect.centery = 150 + lane * LANE_HEIGHT + 25
+
+        # Sub-pixel position, previous step kept for render interpolation
+        self.x = float(self.rect.centerx)
+        self.prev_x = self.x
     
     def animate(self, dt):
         self.frame_index += self.animation_speed * dt
-        self.image = self.frames[int(self.frame_index) % len(self.frames)]
 
-    def move(self, game_duration):
+    def move(self, game_duration, dt):
         self.speed_multiplier = 1 + (game_duration / DIFFICULTY_INCREASE_INTERVAL)  
-        self.rect.x -= self.speed * (self.speed_multiplier / (FPS/1.5))
+        self.prev_x = self.x
+        self.x -= self.speed * self.speed_multiplier * 1.5 * dt
+        self.rect.centerx = round(self.x)
         self.animation_frame += 0.1
 
-    def update(self, game_duration):
+    def update(self, game_duration, dt=TIMESTEP):
+        # Called once per fixed simulation step, so the per-step counters
+        # below advance on simulated time rather than rendered frames.
         if not self.hit:
             # move
-            self.move(game_duration)
+            self.move(game_duration, dt)
 
             # animate 
             self.animation_speed = self.speed_multiplier / 5
@@ -46,48 +83,35 @@ class Zombie:
         if self.hit_effect_time > 0:
             self.hit_effect_time -= 1
     
-    def draw(self, screen):
+    def draw(self, screen, frames, alpha=1.0):
         if self.hit and self.hit_effect_time <= 0:
             return
         
         if not self.hit:
-            screen.blit(self.image, self.rect)
+            # Interpolate between the last two simulation steps
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            image = frames[int(self.frame_index) % len(frames)]
+            return screen.blit(image, image.get_rect(center=(round(x), self.rect.centery)))
         
         # Hit effect
         if self.hit_effect_time > 0:
             effect_radius = self.rect.width // 2 + (10 - self.hit_effect_time) * 2
-            pygame.draw.circle(screen, YELLOW, self.rect.center, effect_radius, 3)
+            return pygame.draw.circle(screen, YELLOW, self.rect.center, effect_radius, 3)
     
+    @property
+    def left(self):
+        return self.rect.left
+
     def get_hit_rect(self):
         return self.rect
     
     def is_clickable(self):
         return not self.hit and not self.target and self.rect.right > 0
     
-    def take_hit(self):
+    def take_hit(self, now):
         self.hit = True
         self.hit_effect_time = 10
         
         # Calculate time alive to determine score category
-        current_time = pygame.time.get_ticks()
-        time_alive = (current_time - self.spawn_time) / 1000.0  # Convert to seconds
-        
-        # Determine score and category based on timing
-        if time_alive <= 0.5:
-            score = 100
-            category = "PERFECT"
-            color = GOLD
-        elif time_alive <= 1.5:
-            score = 75
-            category = "GREAT"
-            color = GREEN
-        elif time_alive <= 3.0:
-            score = 60
-            category = "GOOD"
-            color = BLUE
-        else:
-            score = 50
-            category = "NOT BAD"
-            color = WHITE
-            
-        return score, category, color
\ No newline at end of file
+        time_alive = (now - self.spawn_time) / 1000.0  # Convert to seconds
+        return score_for_time_alive(time_alive)
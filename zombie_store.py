@@ -0,0 +1,254 @@
+"""
+Array-backed zombie store (optional, needs NumPy).
+
+Zombie state lives in NumPy columns instead of one Python object per
+zombie, so movement, animation, the "reached the house" check and removal
+are a handful of vectorized operations per step no matter how many zombies
+are alive. The rest of the game talks to zombies through ZombieView
+handles, which expose the same interface as zombie.Zombie.
+
+Live zombies fill the first rows of the columns in spawn order: spawning
+appends a row and removal compacts the rest down with one masked copy per
+column, so iterating needs no sorting. A handle knows its zombie by spawn
+number; `row` maps that to the zombie's current row, and `retired` keeps
+the last state of removed zombies (by spawn number) for the handles that
+are still held, e.g. by a cherry bomb in flight.
+"""
+
+import numpy as np
+
+from settings import *
+from zombie import score_for_time_alive
+
+HOUSE_X = int(SCREEN_WIDTH * 0.2)
+
+ZOMBIE_COLUMNS = {
+    'id': np.int64,  # spawn number
+    'lane': np.int16,
+    'x': np.float64,
+    'prev_x': np.float64,
+    'left': np.int32,  # rect.left, kept for the hit-test index (see spatial_index.py)
+    'speed': np.float64,
+    'frame_index': np.float64,
+    'spawn_time': np.int64,
+    'hit_effect_time': np.int16,
+    'hit': np.bool_,
+    'target': np.bool_,
+}
+
+
+class ZombieView:
+    """Zombie-compatible handle onto one zombie of a ZombieStore"""
+    __slots__ = ('store', 'id', 'index_order')
+
+    def __init__(self, store, zombie_id):
+        self.store = store
+        self.id = zombie_id
+
+    def columns(self):
+        """(columns, index) holding this zombie: a live row, or its retired copy"""
+        store = self.store
+        row = store.row[self.id]
+        return (store, row) if row >= 0 else (store.retired, self.id)
+
+    @property
+    def lane(self):
+        columns, i = self.columns()
+        return int(columns.lane[i])
+
+    @property
+    def spawn_time(self):
+        columns, i = self.columns()
+        return int(columns.spawn_time[i])
+
+    @property
+    def hit(self):
+        columns, i = self.columns()
+        return bool(columns.hit[i])
+
+    @property
+    def target(self):
+        columns, i = self.columns()
+        return bool(columns.target[i])
+
+    @target.setter
+    def target(self, value):
+        columns, i = self.columns()
+        columns.target[i] = value
+
+    @property
+    def hit_effect_time(self):
+        columns, i = self.columns()
+        return int(columns.hit_effect_time[i])
+
+    @property
+    def left(self):
+        columns, i = self.columns()
+        return int(columns.left[i])
+
+    @property
+    def rect(self):
+        columns, i = self.columns()
+        return pygame.Rect((int(columns.left[i]), lane_top(columns.lane[i], self.store.frame_size)),
+                           self.store.frame_size)
+
+    def draw(self, screen, frames, alpha=1.0):
+        store, row = self.columns()
+        if store.hit[row] and store.hit_effect_time[row] <= 0:
+            return
+
+        if not store.hit[row]:
+            # Interpolate between the last two simulation steps
+            x = store.prev_x[row] + (store.x[row] - store.prev_x[row]) * alpha
+            image = frames[int(store.frame_index[row]) % len(frames)]
+            return screen.blit(image, image.get_rect(center=(round(x), lane_center_y(store.lane[row]))))
+
+        # Hit effect
+        if store.hit_effect_time[row] > 0:
+            rect = self.rect
+            effect_radius = rect.width // 2 + (10 - int(store.hit_effect_time[row])) * 2
+            return pygame.draw.circle(screen, YELLOW, rect.center, effect_radius, 3)
+
+    def get_hit_rect(self):
+        return self.rect
+
+    def is_clickable(self):
+        columns, i = self.columns()
+        return not columns.hit[i] and not columns.target[i] and columns.left[i] + self.store.frame_size[0] > 0
+
+    def take_hit(self, now):
+        columns, i = self.columns()
+        columns.hit[i] = True
+        columns.hit_effect_time[i] = 10
+
+        # Calculate time alive to determine score category
+        time_alive = (now - int(columns.spawn_time[i])) / 1000.0  # Convert to seconds
+        return score_for_time_alive(time_alive)
+
+
+def lane_center_y(lane):
+    return 150 + int(lane) * LANE_HEIGHT + 25
+
+
+def lane_top(lane, frame_size):
+    # Same rounding as setting Rect.center
+    return lane_center_y(lane) - frame_size[1] // 2
+
+
+class ZombieColumns:
+    """One array per column of ZOMBIE_COLUMNS"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        for name, dtype in ZOMBIE_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def grow(self, capacity):
+        for name in ZOMBIE_COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.capacity] = column
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+
+class ZombieStore(ZombieColumns):
+    def __init__(self, frame_size=ZOMBIE_SIZE, capacity=64):
+        super().__init__(capacity)
+        self.frame_size = frame_size
+        self.count = 0  # live zombies, in rows [0, count)
+        self.views = np.empty(capacity, dtype=object)  # handle of every live row
+        self.next_id = 0
+        self.row = np.full(capacity, -1, dtype=np.int64)  # spawn number -> live row, -1 once removed
+        self.retired = ZombieColumns(capacity)  # removed zombies by spawn number
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Yield live zombies in spawn order, matching the old list order"""
+        return iter(self.views[:self.count].tolist())
+
+    def grow(self, capacity):
+        super().grow(capacity)
+        views = np.empty(capacity, dtype=object)
+        views[:self.count] = self.views[:self.count]
+        self.views = views
+
+    def grow_ids(self, capacity):
+        row = np.full(capacity, -1, dtype=np.int64)
+        row[:len(self.row)] = self.row
+        self.row = row
+        self.retired.grow(capacity)
+
+    def spawn(self, lane, spawn_x, spawn_time):
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        if self.next_id == len(self.row):
+            self.grow_ids(len(self.row) * 2)
+        row = self.count
+        zombie_id = self.next_id
+        self.next_id += 1
+        self.count += 1
+        self.id[row] = zombie_id
+        self.lane[row] = lane
+        self.x[row] = self.prev_x[row] = spawn_x
+        self.left[row] = round(spawn_x) - self.frame_size[0] // 2
+        self.speed[row] = ZOMBIE_SPEED_BASE
+        self.frame_index[row] = 0
+        self.spawn_time[row] = spawn_time
+        self.hit_effect_time[row] = 0
+        self.hit[row] = False
+        self.target[row] = False
+        self.row[zombie_id] = row
+        view = self.views[row] = ZombieView(self, zombie_id)
+        return view
+
+    def update(self, game_duration, dt):
+        """
+        Advance every zombie by one step and drop finished ones.
+
+        Returns the zombies that reached the house this step, in spawn order.
+        """
+        n = self.count
+        if not n:
+            return []
+        x, hit, hit_effect_time = self.x[:n], self.hit[:n], self.hit_effect_time[:n]
+        moving = ~hit
+        speed_multiplier = 1 + (game_duration / DIFFICULTY_INCREASE_INTERVAL)
+
+        # move
+        self.prev_x[:n][moving] = x[moving]
+        x[moving] -= self.speed[:n][moving] * speed_multiplier * 1.5 * dt
+        left = self.left[:n]
+        left[:] = np.rint(x) - self.frame_size[0] // 2
+
+        # animate
+        self.frame_index[:n][moving] += (speed_multiplier / 5) * speed_multiplier
+
+        # Update hit effect
+        hit_effect_time[hit_effect_time > 0] -= 1
+
+        reached = moving & (left + self.frame_size[0] < HOUSE_X)
+        removed = reached | (hit & (hit_effect_time <= 0))
+        if not removed.any():
+            return []
+        reached_views = self.views[:n][reached].tolist()
+
+        # Removed zombies may still be referenced (e.g. by a cherry bomb in
+        # flight), so their handles read the retired copy from now on
+        ids = self.id[:n][removed]
+        for name in ZOMBIE_COLUMNS:
+            getattr(self.retired, name)[ids] = getattr(self, name)[:n][removed]
+        self.row[ids] = -1
+
+        # Compact the survivors to the front, keeping spawn order
+        kept = ~removed
+        m = n - len(ids)
+        for name in ZOMBIE_COLUMNS:
+            column = getattr(self, name)
+            column[:m] = column[:n][kept]
+        self.views[:m] = self.views[:n][kept]
+        self.views[m:n] = None
+        self.row[self.id[:m]] = np.arange(m)
+        self.count = m
+        return reached_views